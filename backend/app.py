@@ -1,9 +1,8 @@
 from flask import Flask, jsonify, request
 from flask_cors import CORS
-import pandas as pd
-import numpy as np
 import sys
 import os
+import threading
 import warnings
 
 # === Autoriser l’import depuis la racine du projet ===
@@ -15,12 +14,20 @@ warnings.filterwarnings("ignore", category=FutureWarning)
 warnings.filterwarnings("ignore", message="Trying to unpickle estimator")
 
 # === Imports locaux ===
+# pandas / numpy / sklearn / SQLAlchemy ne sont importés qu'à l'usage (ou par
+# le préchargement en arrière-plan) : /api/health répond dès le démarrage.
 from config import (
-    BEST_MODEL_PATH, METRICS_REPORT_PATH,
-    ATHLETE_MODEL_PATH, ATHLETE_SCALER_PATH, ATHLETE_METRICS_PATH,
-    CLUSTERS_CSV_PATH, ALLOWED_ORIGINS, OUTPUT_DIR
+    METRICS_REPORT_PATH, ATHLETE_METRICS_PATH, ALLOWED_ORIGINS,
+    SERVE_FROM_MEMORY, MEMORY_REFRESH_SECONDS, COALESCE_TIMEOUT_SECONDS, WARMUP_ON_START,
+    LEADERBOARD_MAX_LIMIT
 )
-from utils import safe_load_json, safe_load_model
+from utils import normalize_key, records, safe_load_json
+from artifacts import Artifacts, artifacts_present
+from exports import EXPORT_FORMATS, stream_query
+from profiling import init_profiling
+from singleflight import SingleFlight, SingleFlightTimeout
+from database.circuit_breaker import DatabaseUnavailable
+from database.connexion import DB_BREAKER_RESET, db_breaker, db_call
 
 
 # =========================================================
@@ -28,27 +35,68 @@ from utils import safe_load_json, safe_load_model
 # =========================================================
 app = Flask(__name__)
 CORS(app, resources={r"/api/*": {"origins": ALLOWED_ORIGINS}})
+init_profiling(app)
 
 
 # =========================================================
-# 📦 Chargement des artefacts au démarrage
+# 📦 Chargement des artefacts
 # =========================================================
-country_model = safe_load_model(BEST_MODEL_PATH)
+# Métriques JSON : légères, lues au démarrage
 metrics_report = safe_load_json(METRICS_REPORT_PATH)
-
-athlete_model = safe_load_model(ATHLETE_MODEL_PATH)
-athlete_scaler = safe_load_model(ATHLETE_SCALER_PATH)
 athlete_metrics = safe_load_json(ATHLETE_METRICS_PATH)
 
-COUNTRY_ENCODER_PATH = os.path.join(OUTPUT_DIR, "country_encoder.pkl")
-country_encoder = safe_load_model(COUNTRY_ENCODER_PATH)
+# Modèles + clusters.csv : chargés par le préchargement ou à la première requête
+artifacts = Artifacts()
+
+# Mode lecture en mémoire (optionnel) : rafraîchi à chaque nouvel import
+memory_store = None
+
+
+def from_memory() -> bool:
+    return memory_store is not None and memory_store.ready
+
+
+def warm_up():
+    artifacts.load()
+
+    # Pilotes SQL importés d'avance : la première requête DB ne paie pas leur import
+    from database.connexion import get_engine
+    get_engine()
+
+
+def start_memory_store():
+    global memory_store
+    from memory_store import MemoryStore
+    store = MemoryStore(refresh_seconds=MEMORY_REFRESH_SECONDS)
+    memory_store = store
+    store.start()
+
 
-# Charger clusters.csv si dispo
-clusters_df = None
-try:
-    clusters_df = pd.read_csv(CLUSTERS_CSV_PATH)
-except Exception:
-    clusters_df = None
+def memory_report():
+    if not SERVE_FROM_MEMORY:
+        return None
+    if memory_store is None:
+        return {"ready": False}
+    return memory_store.report()
+
+
+if WARMUP_ON_START:
+    threading.Thread(target=warm_up, name="warmup", daemon=True).start()
+
+# Indépendant du préchargement : WARMUP_ON_START=0 ne désactive pas la mémoire
+if SERVE_FROM_MEMORY:
+    threading.Thread(target=start_memory_store, name="memory-store", daemon=True).start()
+
+
+# Les requêtes concurrentes identiques partagent un seul aller-retour MySQL
+single_flight = SingleFlight(timeout=COALESCE_TIMEOUT_SECONDS)
+
+
+def read_sql_shared(query: str):
+    """pd.read_sql regroupé par requête SQL ; le DataFrame rendu est partagé (ne pas le modifier)."""
+    import pandas as pd
+    from database.connexion import get_engine
+    return single_flight.do(query, lambda: db_call(lambda: pd.read_sql(query, get_engine())))
 
 
 # =========================================================
@@ -58,22 +106,45 @@ def bad_request(msg: str, code: int = 400):
     return jsonify({"status": "error", "message": msg}), code
 
 
+@app.errorhandler(SingleFlightTimeout)
+def coalesce_timeout(e):
+    return bad_request(str(e), 503)
+
+
+@app.errorhandler(DatabaseUnavailable)
+def database_unavailable(e):
+    response, code = bad_request(str(e), 503)
+    response.headers["Retry-After"] = str(int(DB_BREAKER_RESET))
+    return response, code
+
+
+def export_format():
+    fmt = request.args.get("format", "csv").lower()
+    return fmt if fmt in EXPORT_FORMATS else None
+
+
 # =========================================================
 # 💓 API Health check
 # =========================================================
 @app.get("/api/health")
 def health():
+    database = db_breaker.stats()
+    present = artifacts_present()
     return jsonify({
-        "status": "ok",
+        "status": "ok" if database["state"] == "closed" else "degraded",
         "models": {
-            "country_medals": country_model is not None,
-            "athlete": (athlete_model is not None and athlete_scaler is not None)
+            "country_medals": present["country_medals"],
+            "athlete": present["athlete"]
         },
         "resources": {
-            "encoder": country_encoder is not None,
-            "clusters": clusters_df is not None,
+            "encoder": present["encoder"],
+            "clusters": present["clusters"],
             "metrics": metrics_report is not None and athlete_metrics is not None
-        }
+        },
+        "warmup": artifacts.report(),
+        "memory": memory_report(),
+        "coalescing": single_flight.stats(),
+        "database": database
     })
 
 
@@ -82,6 +153,7 @@ def health():
 # =========================================================
 @app.get("/api/countries/clusters")
 def get_clusters():
+    clusters_df = artifacts.load().clusters_df
     if clusters_df is None:
         return bad_request("clusters.csv introuvable dans ml/output.")
     data = clusters_df.to_dict(orient="records")
@@ -93,6 +165,9 @@ def get_clusters():
 # =========================================================
 @app.post("/api/predict/medals")
 def predict_medals():
+    import numpy as np
+
+    country_model = artifacts.load().country_model
     if country_model is None:
         return bad_request("Modèle de prédiction introuvable (best_model.pkl).")
 
@@ -120,16 +195,57 @@ def predict_medals():
     return jsonify({
         "status": "ok",
         "input": payload,
-        "encoder_used": country_encoder is not None,
+        "encoder_used": artifacts.country_encoder is not None,
         "prediction": {"total_medals": y_pred}
     })
 
 
+# =========================================================
+# 🏆 2 bis) Leaderboard des prévisions (scoring batch)
+# =========================================================
+@app.get("/api/predict/leaderboard")
+def forecast_leaderboard():
+    import pandas as pd
+    from database.connexion import get_engine
+    from sqlalchemy import text
+
+    try:
+        year = int(request.args["year"])
+        limit = int(request.args.get("limit", 50))
+    except (KeyError, ValueError):
+        return bad_request("Paramètres attendus : year (entier), season, limit (optionnel).")
+    if limit < 1:
+        return bad_request("limit doit être un entier positif.")
+    limit = min(limit, LEADERBOARD_MAX_LIMIT)
+    season = request.args.get("season", "Summer").capitalize()
+
+    # Lecture indexée de medal_forecasts (ml/model_country_forecast.py)
+    query = text("""
+        SELECT country_name, predicted_medals, predicted_rank
+        FROM medal_forecasts
+        WHERE game_year = :year AND game_season = :season
+        ORDER BY predicted_rank, country_name
+        LIMIT :limit
+    """)
+    df = db_call(lambda: pd.read_sql(query, get_engine(), params={"year": year, "season": season, "limit": limit}))
+
+    return jsonify({
+        "status": "ok",
+        "game": {"year": year, "season": season},
+        "count": len(df),
+        "data": df.to_dict(orient="records")
+    })
+
+
 # =========================================================
 # 🧠 3) Prédiction athlète
 # =========================================================
 @app.post("/api/predict/athlete")
 def predict_athlete():
+    import pandas as pd
+
+    athlete_model = artifacts.load().athlete_model
+    athlete_scaler = artifacts.athlete_scaler
     if athlete_model is None or athlete_scaler is None:
         return bad_request("Modèle athlète introuvable (athlete_model.pkl / scaler).")
 
@@ -186,16 +302,12 @@ def get_metrics():
 # =========================================================
 @app.get("/api/games")
 def get_games():
-    from database.connexion import get_connection
-    from sqlalchemy import create_engine
-
-    conn = get_connection()
-    engine = create_engine(
-        f"mysql+pymysql://{conn.user.decode()}:{conn.password.decode()}@{conn.host}:{conn.port}/{conn.db.decode()}"
-    )
+    if from_memory():
+        df = memory_store.games(request.args.get("season"))
+        return jsonify({"status": "ok", "count": len(df), "data": records(df)})
 
-    query = "SELECT game_name, game_year, game_season, game_location FROM hosts ORDER BY game_year DESC"
-    df = pd.read_sql(query, engine)
+    query = "SELECT game_slug, game_name, game_year, game_season, game_location FROM hosts ORDER BY game_year DESC"
+    df = read_sql_shared(query)
 
     season = request.args.get("season")
     if season:
@@ -208,21 +320,56 @@ def get_games():
     })
 
 
+@app.get("/api/games/<slug>/medal-table")
+def games_medal_table(slug):
+    import pandas as pd
+    from database.connexion import get_engine
+    from sqlalchemy import text
+
+    # Classement précalculé à l'import (scripts/medal_tables.py) : une lecture indexée
+    query = text("""
+        SELECT g.game_slug, g.game_name, g.game_year, g.game_season,
+               mt.medal_rank AS `rank`, c.country_name, c.country_3_letter_code,
+               mt.gold, mt.silver, mt.bronze, mt.total
+        FROM games g
+        JOIN medal_tables mt ON mt.game_id = g.id
+        JOIN countries c ON c.id = mt.country_id
+        WHERE g.game_key = :key
+        ORDER BY mt.medal_rank, c.country_name
+    """)
+    df = db_call(lambda: pd.read_sql(query, get_engine(), params={"key": normalize_key(slug)}))
+    if df.empty:
+        return bad_request(f"Aucun tableau des médailles pour l'édition '{slug}'.", 404)
+
+    game = records(df.iloc[:1][["game_slug", "game_name", "game_year", "game_season"]])[0]
+    data = records(df.drop(columns=["game_slug", "game_name", "game_year", "game_season"]))
+
+    return jsonify({
+        "status": "ok",
+        "game": {
+            "slug": game["game_slug"], "name": game["game_name"],
+            "year": game["game_year"], "season": game["game_season"]
+        },
+        "count": len(data),
+        "data": data
+    })
+
+
 # =========================================================
 # 🥇 6) API Résultats
 # =========================================================
 @app.get("/api/results")
 def get_results():
-    from database.connexion import get_connection
-    from sqlalchemy import create_engine
-
-    conn = get_connection()
-    engine = create_engine(
-        f"mysql+pymysql://{conn.user.decode()}:{conn.password.decode()}@{conn.host}:{conn.port}/{conn.db.decode()}"
-    )
+    if from_memory():
+        df = memory_store.results(
+            country=request.args.get("country"),
+            game=request.args.get("game"),
+            season=request.args.get("season"),
+        )
+        return jsonify({"status": "ok", "count": len(df), "data": records(df.head(50))})
 
     query = "SELECT country_name, discipline_title, medal_type, slug_game, event_title FROM results"
-    df = pd.read_sql(query, engine)
+    df = read_sql_shared(query)
 
     country = request.args.get("country")
     game = request.args.get("game")
@@ -242,18 +389,40 @@ def get_results():
     })
 
 
+@app.get("/api/results/export")
+def export_results():
+    fmt = export_format()
+    if fmt is None:
+        return bad_request(f"Format invalide (attendu: {list(EXPORT_FORMATS)}).")
+
+    # Mêmes filtres que /api/results, mais appliqués côté SQL
+    clauses, params = [], {}
+    for arg, column in (("country", "country_name"), ("game", "slug_game"), ("season", "slug_game")):
+        value = request.args.get(arg)
+        if value:
+            clauses.append(f"{column} LIKE :{arg}")
+            params[arg] = f"%{value}%"
+
+    query = "SELECT country_name, discipline_title, medal_type, slug_game, event_title FROM results"
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+
+    return stream_query(query, params, fmt, "results")
+
+
 # =========================================================
 # 🧑‍🤝‍🧑 7) API Athletes
 # =========================================================
 @app.get("/api/athletes")
 def get_athletes():
-    from database.connexion import get_connection
-    from sqlalchemy import create_engine
+    if from_memory():
+        data = memory_store.top_athletes()
+        return jsonify({"status": "ok", "count": len(data), "data": data})
+
+    import pandas as pd
+    from database.connexion import get_engine
 
-    conn = get_connection()
-    engine = create_engine(
-        f"mysql+pymysql://{conn.user.decode()}:{conn.password.decode()}@{conn.host}:{conn.port}/{conn.db.decode()}"
-    )
+    engine = get_engine()
 
     query = """
         SELECT athlete_full_name, games_participations, athlete_year_birth
@@ -261,7 +430,7 @@ def get_athletes():
         ORDER BY games_participations DESC
         LIMIT 100
     """
-    df = pd.read_sql(query, engine)
+    df = db_call(lambda: pd.read_sql(query, engine))
 
     return jsonify({
         "status": "ok",
@@ -270,20 +439,58 @@ def get_athletes():
     })
 
 
+@app.get("/api/athletes/export")
+def export_athletes():
+    fmt = export_format()
+    if fmt is None:
+        return bad_request(f"Format invalide (attendu: {list(EXPORT_FORMATS)}).")
+
+    query = """
+        SELECT athlete_full_name, games_participations, athlete_year_birth
+        FROM athletes
+        ORDER BY games_participations DESC
+    """
+    return stream_query(query, {}, fmt, "athletes")
+
+
+@app.get("/api/athletes/history")
+def athlete_history():
+    import pandas as pd
+    from database.connexion import get_engine
+    from sqlalchemy import text
+
+    athlete = request.args.get("athlete")
+    if not athlete:
+        return bad_request("Paramètre 'athlete' requis (nom complet ou athlete_url).")
+
+    # Jointure indexée sur results_athletes (plus de parsing JSON de results.athletes)
+    query = text("""
+        SELECT r.slug_game, r.discipline_title, r.event_title, r.medal_type, r.country_name
+        FROM results_athletes ra
+        JOIN results r ON r.id = ra.result_id
+        WHERE ra.athlete_url = :athlete OR ra.athlete_full_name = :athlete
+    """)
+    df = db_call(lambda: pd.read_sql(query, get_engine(), params={"athlete": athlete}))
+
+    medals = df["medal_type"].dropna().str.upper().value_counts()
+
+    return jsonify({
+        "status": "ok",
+        "count": len(df),
+        "medals": {m: int(medals.get(m, 0)) for m in ("GOLD", "SILVER", "BRONZE")},
+        "data": df.to_dict(orient="records")
+    })
+
+
 @app.get("/api/overview")
 def overview():
-    from database.connexion import get_connection
-    from sqlalchemy import create_engine
-
-    conn = get_connection()
-    engine = create_engine(
-        f"mysql+pymysql://{conn.user.decode()}:{conn.password.decode()}@{conn.host}:{conn.port}/{conn.db.decode()}"
-    )
-
-    total_medals = pd.read_sql("SELECT COUNT(*) AS total FROM results", engine)["total"][0]
-    total_athletes = pd.read_sql("SELECT COUNT(DISTINCT athlete_full_name) AS total FROM athletes", engine)["total"][0]
-    total_countries = pd.read_sql("SELECT COUNT(DISTINCT country_name) AS total FROM results", engine)["total"][0]
-    total_events = pd.read_sql("SELECT COUNT(DISTINCT event_title) AS total FROM results", engine)["total"][0]
+    if from_memory():
+        return jsonify(memory_store.overview())
+
+    total_medals = read_sql_shared("SELECT COUNT(*) AS total FROM results")["total"][0]
+    total_athletes = read_sql_shared("SELECT COUNT(DISTINCT athlete_full_name) AS total FROM athletes")["total"][0]
+    total_countries = read_sql_shared("SELECT COUNT(DISTINCT country_name) AS total FROM results")["total"][0]
+    total_events = read_sql_shared("SELECT COUNT(DISTINCT event_title) AS total FROM results")["total"][0]
 
     return jsonify({
         "totalMedals": int(total_medals),
@@ -0,0 +1,71 @@
+import os
+import threading
+import time
+
+from config import (
+    BEST_MODEL_PATH, ATHLETE_MODEL_PATH, ATHLETE_SCALER_PATH, CLUSTERS_CSV_PATH, OUTPUT_DIR
+)
+from utils import safe_load_model
+
+COUNTRY_ENCODER_PATH = os.path.join(OUTPUT_DIR, "country_encoder.pkl")
+
+
+# =========================================================
+# 📦 Artefacts ML chargés à la demande
+# =========================================================
+# Les modèles (sklearn via joblib) et clusters.csv (pandas) coûtent plusieurs
+# secondes d'import : l'API démarre sans eux, un thread les charge en
+# arrière-plan, et une requête qui en a besoin avant la fin attend ce
+# chargement (une seule fois, sous verrou).
+
+class Artifacts:
+    def __init__(self):
+        self.country_model = None
+        self.country_encoder = None
+        self.athlete_model = None
+        self.athlete_scaler = None
+        self.clusters_df = None
+
+        self.loaded = False
+        self.load_seconds = None
+        self.error = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        if self.loaded:
+            return self
+        with self._lock:
+            if self.loaded:
+                return self
+            start = time.perf_counter()
+            try:
+                import pandas as pd
+
+                self.country_model = safe_load_model(BEST_MODEL_PATH)
+                self.country_encoder = safe_load_model(COUNTRY_ENCODER_PATH)
+                self.athlete_model = safe_load_model(ATHLETE_MODEL_PATH)
+                self.athlete_scaler = safe_load_model(ATHLETE_SCALER_PATH)
+                try:
+                    self.clusters_df = pd.read_csv(CLUSTERS_CSV_PATH)
+                except Exception:
+                    self.clusters_df = None
+            except Exception as e:
+                # Artefact illisible : les routes concernées répondent "introuvable"
+                self.error = f"{type(e).__name__}: {e}"
+                print("⚠️ Chargement des artefacts ML incomplet :", e)
+            self.load_seconds = round(time.perf_counter() - start, 2)
+            self.loaded = True
+        return self
+
+    def report(self) -> dict:
+        return {"ready": self.loaded, "load_seconds": self.load_seconds, "error": self.error}
+
+
+def artifacts_present() -> dict:
+    """Présence des fichiers, sans les charger (pour /api/health)."""
+    return {
+        "country_medals": os.path.exists(BEST_MODEL_PATH),
+        "athlete": os.path.exists(ATHLETE_MODEL_PATH) and os.path.exists(ATHLETE_SCALER_PATH),
+        "encoder": os.path.exists(COUNTRY_ENCODER_PATH),
+        "clusters": os.path.exists(CLUSTERS_CSV_PATH),
+    }
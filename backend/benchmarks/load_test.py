@@ -0,0 +1,371 @@
+# Benchmark HTTP de l'API : débit et latences p50/p95/p99 par route, avec baselines JSON
+import argparse
+import json
+import os
+import random
+import shutil
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+BASELINES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+# =========================================================
+# 🎯 Routes mesurées
+# =========================================================
+ROUTES = [
+    {"name": "health", "method": "GET", "path": "/api/health"},
+    {"name": "clusters", "method": "GET", "path": "/api/countries/clusters"},
+    {"name": "metrics", "method": "GET", "path": "/api/metrics"},
+    {"name": "predict_medals", "method": "POST", "path": "/api/predict/medals",
+     "body": {"country_name": "France", "game_year": 2028, "game_season": "Summer"}},
+    {"name": "predict_athlete", "method": "POST", "path": "/api/predict/athlete",
+     "body": {"age": 25, "games_participations": 2}},
+    {"name": "leaderboard", "method": "GET", "path": "/api/predict/leaderboard?year=2028&season=Summer"},
+    {"name": "games", "method": "GET", "path": "/api/games"},
+    {"name": "games_season", "method": "GET", "path": "/api/games?season=Winter"},
+    {"name": "medal_table", "method": "GET", "path": "/api/games/city-2008/medal-table"},
+    {"name": "results", "method": "GET", "path": "/api/results"},
+    {"name": "results_country", "method": "GET", "path": "/api/results?country=France&season=summer"},
+    {"name": "results_export", "method": "GET", "path": "/api/results/export?country=France&format=ndjson"},
+    {"name": "athletes", "method": "GET", "path": "/api/athletes"},
+    {"name": "athletes_export", "method": "GET", "path": "/api/athletes/export"},
+    {"name": "athlete_history", "method": "GET", "path": "/api/athletes/history?athlete=athlete-00042"},
+    {"name": "overview", "method": "GET", "path": "/api/overview"},
+]
+
+
+# =========================================================
+# 🗄️ Base de substitution (SQLite + données synthétiques)
+# =========================================================
+def seed_database(path, rows, seed=42):
+    rng = random.Random(seed)
+    if os.path.exists(path):
+        os.remove(path)
+    db = sqlite3.connect(path)
+
+    db.executescript("""
+        CREATE TABLE hosts (game_slug TEXT, game_end_date TEXT, game_start_date TEXT, game_location TEXT,
+                            game_name TEXT, game_season TEXT, game_year INTEGER);
+        CREATE TABLE results (id INTEGER PRIMARY KEY, discipline_title TEXT, event_title TEXT, slug_game TEXT,
+                              participant_type TEXT, medal_type TEXT, country_name TEXT,
+                              athlete_url TEXT, athlete_full_name TEXT);
+        CREATE TABLE results_athletes (id INTEGER PRIMARY KEY, result_id INTEGER, athlete_full_name TEXT, athlete_url TEXT);
+        CREATE INDEX idx_results_athletes_url ON results_athletes (athlete_url);
+        CREATE INDEX idx_results_athletes_name ON results_athletes (athlete_full_name);
+        CREATE TABLE athletes (athlete_url TEXT, athlete_full_name TEXT, games_participations INTEGER,
+                               first_game TEXT, athlete_year_birth REAL, athlete_medals TEXT, bio TEXT);
+        CREATE TABLE medal_forecasts (game_year INTEGER, game_season TEXT, country_name TEXT,
+                                      predicted_medals INTEGER, predicted_rank INTEGER, scored_at TEXT);
+        CREATE INDEX idx_medal_forecasts_rank ON medal_forecasts (game_year, game_season, predicted_rank);
+        CREATE TABLE import_meta (id INTEGER PRIMARY KEY, version TEXT, imported_at TEXT);
+        CREATE TABLE games (id INTEGER PRIMARY KEY, game_key TEXT UNIQUE, game_slug TEXT, game_name TEXT,
+                            game_year INTEGER, game_season TEXT);
+        CREATE TABLE countries (id INTEGER PRIMARY KEY, country_name TEXT, country_3_letter_code TEXT);
+        CREATE TABLE medal_tables (game_id INTEGER, country_id INTEGER, gold INTEGER, silver INTEGER,
+                                   bronze INTEGER, total INTEGER, medal_rank INTEGER,
+                                   PRIMARY KEY (game_id, country_id));
+        CREATE INDEX idx_medal_tables_rank ON medal_tables (game_id, medal_rank);
+    """)
+
+    countries = ["France", "Germany", "Japan", "Kenya", "Brazil"] + [f"Country {i:03d}" for i in range(150)]
+    disciplines = [f"Discipline {i}" for i in range(40)]
+
+    games = []
+    for year in range(1896, 2024, 4):
+        games.append((f"city-{year}", "", "", rng.choice(countries), f"City {year}", "Summer", year))
+    for year in list(range(1924, 1993, 4)) + list(range(1994, 2023, 4)):
+        games.append((f"town-{year}", "", "", rng.choice(countries), f"Town {year}", "Winter", year))
+    db.executemany("INSERT INTO hosts VALUES (?, ?, ?, ?, ?, ?, ?)", games)
+
+    n_athletes = max(rows // 2, 100)
+    results, participants = [], []
+    for i in range(1, rows + 1):
+        game = rng.choice(games)
+        athlete = f"athlete-{rng.randrange(n_athletes):05d}"
+        results.append((
+            i, rng.choice(disciplines), f"Event {rng.randrange(300)}", game[0], "Athlete",
+            rng.choice(["GOLD", "SILVER", "BRONZE", None, None]), rng.choice(countries),
+            athlete, athlete,
+        ))
+        participants.append((i, athlete, athlete))
+    db.executemany("INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", results)
+    db.executemany("INSERT INTO results_athletes (result_id, athlete_full_name, athlete_url) VALUES (?, ?, ?)",
+                   participants)
+
+    db.executemany("INSERT INTO athletes VALUES (?, ?, ?, ?, ?, ?, ?)", [
+        (f"athlete-{i:05d}", f"athlete-{i:05d}", rng.randint(1, 6), "", rng.randint(1920, 2006),
+         None, "x" * rng.randint(0, 400))
+        for i in range(n_athletes)
+    ])
+
+    ranked = sorted(countries, key=lambda _: rng.random())
+    db.executemany("INSERT INTO medal_forecasts VALUES (2028, 'Summer', ?, ?, ?, '')", [
+        (c, len(ranked) - r, r + 1) for r, c in enumerate(ranked)
+    ])
+    db.execute("INSERT INTO import_meta VALUES (1, 'bench', '')")
+
+    # Dimensions + tableaux des médailles, calculés comme à l'import
+    sys.path.extend([BACKEND_DIR, os.path.join(BACKEND_DIR, "scripts")])
+    import pandas as pd
+    from medal_tables import compute_medal_tables
+    from utils import normalize_key
+
+    game_ids = {g[0]: i for i, g in enumerate(games, 1)}
+    country_ids = {c: i for i, c in enumerate(countries, 1)}
+    db.executemany("INSERT INTO games VALUES (?, ?, ?, ?, ?, ?)", [
+        (game_ids[g[0]], normalize_key(g[0]), g[0], g[4], g[6], g[5]) for g in games
+    ])
+    db.executemany("INSERT INTO countries VALUES (?, ?, ?)", [(i, c, c[:3].upper()) for c, i in country_ids.items()])
+    medals = pd.DataFrame(
+        [(game_ids[r[3]], country_ids[r[6]], r[1], r[2], "Mixed", r[4], None, r[5]) for r in results if r[5]],
+        columns=["game_id", "country_id", "discipline_title", "event_title", "event_gender",
+                 "participant_type", "participant_title", "medal_type"]
+    )
+    db.executemany("INSERT INTO medal_tables VALUES (?, ?, ?, ?, ?, ?, ?)",
+                   list(compute_medal_tables(medals).itertuples(index=False, name=None)))
+
+    db.commit()
+    db.close()
+
+
+# =========================================================
+# 🧪 Artefacts ML de substitution
+# =========================================================
+def prepare_artifacts(output_dir, seed=42):
+    """Copie ml/output et y entraîne un petit modèle athlète : /api/predict/athlete répond 200."""
+    import joblib
+    import numpy as np
+    import pandas as pd
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.preprocessing import StandardScaler
+
+    source = os.path.join(BACKEND_DIR, "ml", "output")
+    if os.path.isdir(source):
+        shutil.copytree(source, output_dir, dirs_exist_ok=True)
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Mêmes colonnes que ml/model_athlete_medal.py
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame({
+        "games_participations": rng.integers(1, 7, 500).astype(np.float32),
+        "athlete_age": rng.integers(16, 45, 500).astype(np.float32),
+    })
+    y = (X["games_participations"] + rng.normal(0, 1, 500) > 3).astype(int)
+
+    scaler = StandardScaler()
+    model = RandomForestClassifier(n_estimators=10, random_state=seed)
+    model.fit(scaler.fit_transform(X), y)
+    joblib.dump(model, os.path.join(output_dir, "athlete_model.pkl"))
+    joblib.dump(scaler, os.path.join(output_dir, "athlete_scaler.pkl"))
+
+
+# =========================================================
+# 🚀 Lancement de l'API
+# =========================================================
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def boot_app(db_path, output_dir, memory, log_file):
+    port = free_port()
+    env = dict(
+        os.environ,
+        PORT=str(port),
+        DATABASE_URL=f"sqlite:///{db_path}",
+        ML_OUTPUT_DIR=output_dir,
+        SERVE_FROM_MEMORY="1" if memory else "0",
+        WARMUP_ON_START="1",
+    )
+    proc = subprocess.Popen(
+        [sys.executable, "app.py"], cwd=BACKEND_DIR, env=env,
+        stdout=log_file, stderr=subprocess.STDOUT
+    )
+
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"app.py s'est arrêté (code {proc.returncode}), voir {log_file.name}")
+        try:
+            health = json.loads(urllib.request.urlopen(base_url + "/api/health", timeout=1).read())
+            # On mesure l'API préchargée (modèles, pandas), pas le démarrage à froid
+            warm = health.get("warmup", {}).get("ready", True)
+            # En mode --memory, les lectures ne quittent MySQL qu'une fois les données chargées
+            loaded = not memory or (health.get("memory") or {}).get("ready", False)
+            if warm and loaded:
+                return proc, base_url
+        except (urllib.error.URLError, ConnectionError, socket.timeout):
+            pass
+        time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("app.py ne répond pas sur /api/health après 60s")
+
+
+# =========================================================
+# 📈 Mesures
+# =========================================================
+def call(base_url, route):
+    data = None
+    headers = {}
+    if "body" in route:
+        data = json.dumps(route["body"]).encode()
+        headers["Content-Type"] = "application/json"
+    req = urllib.request.Request(base_url + route["path"], data=data, headers=headers, method=route["method"])
+
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=60) as resp:
+            resp.read()
+            status = resp.status
+    except urllib.error.HTTPError as e:
+        e.read()
+        status = e.code
+    except (urllib.error.URLError, ConnectionError, socket.timeout):
+        status = 0
+    return time.perf_counter() - start, status
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[idx]
+
+
+def bench_route(base_url, route, requests, concurrency):
+    call(base_url, route)  # échauffement (caches, pool de connexions)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(lambda _: call(base_url, route), range(requests)))
+    wall = time.perf_counter() - start
+
+    latencies = sorted(s[0] * 1000 for s in samples)
+    statuses = {}
+    for _, status in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "throughput_rps": round(requests / wall, 2),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "statuses": statuses,
+    }
+
+
+# =========================================================
+# ⚖️ Comparaison avec une baseline
+# =========================================================
+def error_share(route_report):
+    """Part des réponses hors 2xx (erreurs, 503, connexions refusées = statut 0)."""
+    statuses = route_report["statuses"]
+    errors = sum(count for status, count in statuses.items() if not status.startswith("2"))
+    return round(errors / max(sum(statuses.values()), 1), 4)
+
+
+def compare(current, baseline, threshold, min_delta_ms):
+    """Liste des régressions (route, métrique, avant, après) au-delà du seuil."""
+    regressions = []
+    for name, now in current["routes"].items():
+        before = baseline.get("routes", {}).get(name)
+        if before is None:
+            continue
+        # Une route qui passe de 200 à 400/503 (ou l'inverse) répond vite mais ne mesure
+        # plus le même chemin : les latences ne sont alors pas comparables
+        if error_share(now) != error_share(before):
+            regressions.append((name, "non_2xx_share", error_share(before), error_share(now)))
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            if now[metric] > before[metric] * (1 + threshold) and now[metric] - before[metric] > min_delta_ms:
+                regressions.append((name, metric, before[metric], now[metric]))
+        if now["throughput_rps"] < before["throughput_rps"] * (1 - threshold):
+            regressions.append((name, "throughput_rps", before["throughput_rps"], now["throughput_rps"]))
+    return regressions
+
+
+def baseline_path(value):
+    """Un simple nom (ex. "local") désigne benchmarks/baselines/local.json."""
+    if os.path.dirname(value):
+        return value
+    return os.path.join(BASELINES_DIR, value if value.endswith(".json") else f"{value}.json")
+
+
+def print_report(report):
+    print(f"\n{'route':<18}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}  statuts")
+    for name, r in report["routes"].items():
+        print(f"{name:<18}{r['throughput_rps']:>9.1f}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}  {r['statuses']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark HTTP de l'API Flask sur une base SQLite synthétique")
+    parser.add_argument("--requests", type=int, default=200, help="Requêtes par route")
+    parser.add_argument("--concurrency", type=int, default=8, help="Clients simultanés")
+    parser.add_argument("--rows", type=int, default=20000, help="Lignes synthétiques dans results")
+    parser.add_argument("--routes", nargs="*", help="Sous-ensemble de routes (par nom)")
+    parser.add_argument("--memory", action="store_true", help="Lance l'API avec SERVE_FROM_MEMORY=1")
+    parser.add_argument("--save", help="Enregistre le rapport JSON (nom de baseline ou chemin)")
+    parser.add_argument("--compare", help="Baseline JSON à comparer ; code retour 1 en cas de régression")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Régression tolérée (0.25 = +25 %%)")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="Écart absolu ignoré (bruit)")
+    args = parser.parse_args()
+
+    routes = [r for r in ROUTES if not args.routes or r["name"] in args.routes]
+
+    workdir = tempfile.mkdtemp(prefix="olympics-bench-")
+    db_path = os.path.join(workdir, "bench.db")
+    print(f"🗄️ Base synthétique : {args.rows} résultats → {db_path}")
+    seed_database(db_path, args.rows)
+    output_dir = os.path.join(workdir, "ml_output")
+    prepare_artifacts(output_dir)
+
+    with open(os.path.join(workdir, "app.log"), "w") as log_file:
+        proc, base_url = boot_app(db_path, output_dir, args.memory, log_file)
+        print(f"🚀 API démarrée sur {base_url}")
+        try:
+            report = {
+                "meta": {
+                    "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "rows": args.rows,
+                    "memory": args.memory,
+                    "python": sys.version.split()[0],
+                },
+                "routes": {},
+            }
+            for route in routes:
+                report["routes"][route["name"]] = bench_route(base_url, route, args.requests, args.concurrency)
+                print(f"✅ {route['name']}")
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+    print_report(report)
+
+    if args.save:
+        save_path = baseline_path(args.save)
+        os.makedirs(os.path.dirname(os.path.abspath(save_path)), exist_ok=True)
+        with open(save_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+        print(f"\n💾 Rapport enregistré : {save_path}")
+
+    if args.compare:
+        with open(baseline_path(args.compare), "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"\n❌ {len(regressions)} régression(s) au-delà de {args.threshold:.0%} :")
+            for name, metric, before, now in regressions:
+                print(f"  - {name} {metric} : {before} → {now}")
+            sys.exit(1)
+        print(f"\n✅ Aucune régression par rapport à {args.compare}")
@@ -0,0 +1,137 @@
+# Benchmark du démarrage de l'API : temps d'import par module et délai avant le premier /api/health
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+from load_test import BACKEND_DIR, free_port
+
+# Bibliothèques lourdes qui ne doivent pas être importées par `import app`
+# (chargées à la demande ou par le préchargement en arrière-plan)
+HEAVY_MODULES = ["pandas", "numpy", "sklearn", "joblib", "sqlalchemy", "pymysql", "matplotlib", "pyarrow"]
+
+
+# =========================================================
+# 📦 Temps d'import (python -X importtime)
+# =========================================================
+def import_profile():
+    env = dict(os.environ, WARMUP_ON_START="0")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"`import app` a échoué :\n{proc.stderr[-2000:]}")
+
+    modules = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        # "import time:   self |  cumulé | <1 + 2×profondeur espaces>module"
+        head, cumulative_us, raw_name = line.split("|")
+        self_us = head.split(":")[1]
+        depth = (len(raw_name) - len(raw_name.lstrip()) - 1) // 2
+        modules.append({
+            "name": raw_name.strip(),
+            "depth": depth,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+    return modules
+
+
+# =========================================================
+# 🚀 Démarrage à froid (python app.py)
+# =========================================================
+def cold_start(timeout=60):
+    port = free_port()
+    env = dict(os.environ, PORT=str(port))
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "app.py"], cwd=BACKEND_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    url = f"http://127.0.0.1:{port}/api/health"
+    first_health = warm = None
+    try:
+        while time.perf_counter() - start < timeout:
+            if proc.poll() is not None:
+                raise RuntimeError(f"app.py s'est arrêté (code {proc.returncode})")
+            try:
+                health = json.loads(urllib.request.urlopen(url, timeout=1).read())
+            except (urllib.error.URLError, ConnectionError, socket.timeout):
+                time.sleep(0.01)
+                continue
+            now = time.perf_counter() - start
+            if first_health is None:
+                first_health = now
+            if health.get("warmup", {}).get("ready"):
+                warm = now
+                break
+            time.sleep(0.01)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+    if first_health is None:
+        raise RuntimeError(f"app.py ne répond pas sur /api/health après {timeout}s")
+    return first_health * 1000, (warm * 1000 if warm is not None else None)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mesure le démarrage à froid de l'API Flask")
+    parser.add_argument("--runs", type=int, default=3, help="Démarrages mesurés (médiane retenue)")
+    parser.add_argument("--budget-ms", type=float, default=1500, help="Délai max avant le premier /api/health")
+    parser.add_argument("--top", type=int, default=15, help="Modules affichés")
+    args = parser.parse_args()
+
+    # === 1. Imports
+    modules = import_profile()
+    app_index = next(i for i, m in enumerate(modules) if m["name"] == "app")
+    app_module = modules[app_index]
+
+    # importtime écrit les enfants avant leur parent : sous-arbre de `app` = lignes
+    # qui précèdent la sienne jusqu'au module de profondeur 0 précédent
+    subtree = []
+    for m in reversed(modules[:app_index]):
+        if m["depth"] == 0:
+            break
+        subtree.append(m)
+    direct = sorted((m for m in subtree if m["depth"] == 1), key=lambda m: m["cumulative_ms"], reverse=True)
+
+    print(f"📦 `import app` : {app_module['cumulative_ms']:.0f} ms (dont {app_module['self_ms']:.0f} ms propres)")
+    print(f"\n{'module':<40}{'cumulé ms':>12}{'propre ms':>12}")
+    for m in direct[:args.top]:
+        print(f"{m['name']:<40}{m['cumulative_ms']:>12.1f}{m['self_ms']:>12.1f}")
+
+    imported = {m["name"].split(".")[0] for m in subtree}
+    eager = [name for name in HEAVY_MODULES if name in imported]
+
+    # === 2. Démarrages à froid
+    runs = [cold_start() for _ in range(args.runs)]
+    first_health = statistics.median(r[0] for r in runs)
+    warm_times = [r[1] for r in runs if r[1] is not None]
+    warm = statistics.median(warm_times) if warm_times else None
+
+    print(f"\n🚀 Premier /api/health : {first_health:.0f} ms (médiane sur {args.runs}, budget {args.budget_ms:.0f} ms)")
+    if warm is not None:
+        print(f"🔥 Préchargement terminé : {warm:.0f} ms")
+
+    failures = []
+    if eager:
+        failures.append(f"modules lourds importés au démarrage : {eager}")
+    if first_health > args.budget_ms:
+        failures.append(f"démarrage à froid {first_health:.0f} ms > budget {args.budget_ms:.0f} ms")
+
+    if failures:
+        for f in failures:
+            print(f"❌ {f}")
+        sys.exit(1)
+    print("✅ Démarrage dans le budget")
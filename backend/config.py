@@ -3,8 +3,8 @@ import os
 # 📂 Dossier racine du backend
 BASE_DIR = os.path.dirname(__file__)
 
-# 📂 Dossier ML/output (là où se trouvent les modèles)
-OUTPUT_DIR = os.path.join(BASE_DIR, "ml", "output")
+# 📂 Dossier ML/output (là où se trouvent les modèles) ; ML_OUTPUT_DIR le remplace (benchmarks)
+OUTPUT_DIR = os.environ.get("ML_OUTPUT_DIR", os.path.join(BASE_DIR, "ml", "output"))
 
 # 📄 Fichiers attendus dans ml/output/
 BEST_MODEL_PATH = os.path.join(OUTPUT_DIR, "best_model.pkl")
@@ -20,6 +20,31 @@ CLUSTERS_CSV_PATH = os.path.join(OUTPUT_DIR, "clusters.csv")
 # 🔒 Sécurité / CORS
 ALLOWED_ORIGINS = os.environ.get("ALLOWED_ORIGINS", "*")
 
+# 📤 Exports en streaming (nombre de lignes lues par paquet côté serveur)
+EXPORT_CHUNK_SIZE = int(os.environ.get("EXPORT_CHUNK_SIZE", 2000))
+
+# 🏆 Leaderboard des prévisions : nombre max de pays par réponse (?limit= est plafonné)
+LEADERBOARD_MAX_LIMIT = int(os.environ.get("LEADERBOARD_MAX_LIMIT", 500))
+
+# 🧠 Lecture depuis la mémoire (hosts / results / athletes chargés au démarrage)
+SERVE_FROM_MEMORY = os.environ.get("SERVE_FROM_MEMORY", "0") == "1"
+MEMORY_REFRESH_SECONDS = int(os.environ.get("MEMORY_REFRESH_SECONDS", 60))
+
+# 🛬 Regroupement des requêtes identiques concurrentes (attente max en secondes)
+COALESCE_TIMEOUT_SECONDS = float(os.environ.get("COALESCE_TIMEOUT_SECONDS", 30))
+
+# 🔥 Préchargement en arrière-plan (pandas, modèles, pilotes SQL) dès le démarrage
+WARMUP_ON_START = os.environ.get("WARMUP_ON_START", "1") == "1"
+
+# 🔬 Profilage des requêtes (désactivé par défaut)
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "0") == "1"
+PROFILE_TOKEN = os.environ.get("PROFILE_TOKEN", "")          # requis dans l'en-tête X-Profile-Token
+PROFILE_DIR = os.environ.get("PROFILE_DIR", os.path.join(BASE_DIR, "profiles"))
+PROFILE_INTERVAL_MS = int(os.environ.get("PROFILE_INTERVAL_MS", 5))
+PROFILE_KEEP = int(os.environ.get("PROFILE_KEEP", 50))
+SLOW_REQUEST_MS = int(os.environ.get("SLOW_REQUEST_MS", 0))  # 0 = pas de capture automatique
+SLOW_CAPTURES_PER_MINUTE = int(os.environ.get("SLOW_CAPTURES_PER_MINUTE", 6))
+
 # 🧠 Vérification utile (debug local)
 if __name__ == "__main__":
     print("BASE_DIR :", BASE_DIR)
@@ -0,0 +1,97 @@
+import threading
+import time
+
+
+# =========================================================
+# 🔌 Disjoncteur (circuit breaker) pour la base de données
+# =========================================================
+# closed    : les appels passent, les échecs consécutifs sont comptés
+# open      : après `failure_threshold` échecs, les appels échouent aussitôt
+#             (DatabaseUnavailable → 503) pendant `reset_timeout` secondes
+# half_open : un seul appel d'essai ; succès → closed, échec → open
+
+class DatabaseUnavailable(Exception):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30, is_failure=lambda e: True):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.is_failure = is_failure
+
+        self.state = "closed"
+        self.failures = 0
+        self.trips = 0
+        self.opened_at = None
+        self.last_error = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def _before_call(self):
+        with self._lock:
+            if self.state == "open":
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    raise DatabaseUnavailable("Base de données indisponible (circuit ouvert).")
+                self.state = "half_open"
+            if self.state == "half_open":
+                if self._trial_running:
+                    raise DatabaseUnavailable("Base de données indisponible (essai de reconnexion en cours).")
+                self._trial_running = True
+                return True
+            return False
+
+    def _on_success(self, trial: bool):
+        with self._lock:
+            if trial:
+                self._trial_running = False
+            self.state = "closed"
+            self.failures = 0
+
+    def _on_abort(self, trial: bool):
+        # Appel interrompu (KeyboardInterrupt, SystemExit...) : ni succès ni échec,
+        # on libère seulement l'essai pour qu'un autre puisse être tenté
+        with self._lock:
+            if trial:
+                self._trial_running = False
+
+    def _on_failure(self, trial: bool, error: Exception):
+        with self._lock:
+            if trial:
+                self._trial_running = False
+            self.failures += 1
+            self.last_error = f"{type(error).__name__}: {error}"
+            if trial or (self.state == "closed" and self.failures >= self.failure_threshold):
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                self.trips += 1
+
+    def call(self, fn):
+        trial = self._before_call()
+        try:
+            result = fn()
+        except Exception as e:
+            if self.is_failure(e):
+                self._on_failure(trial, e)
+                raise DatabaseUnavailable("Base de données indisponible.") from e
+            # Erreur applicative (SQL invalide...) : la base a répondu
+            self._on_success(trial)
+            raise
+        except BaseException:
+            self._on_abort(trial)
+            raise
+        self._on_success(trial)
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            retry_in = None
+            if self.state == "open":
+                retry_in = max(0.0, round(self.reset_timeout - (time.monotonic() - self.opened_at), 1))
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "trips": self.trips,
+                "retry_in_seconds": retry_in,
+                "last_error": self.last_error,
+            }
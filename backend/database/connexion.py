@@ -1,7 +1,15 @@
 import os
-import pymysql
+import random
+import sys
+import time
 from dotenv import load_dotenv
 
+# Permet aussi l'exécution directe (python database/connexion.py)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from database.circuit_breaker import CircuitBreaker
+
+# pymysql / SQLAlchemy sont importés à la première connexion (démarrage de l'API plus rapide)
+
 # Charger le fichier .env
 load_dotenv()
 
@@ -12,29 +20,121 @@ DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_DATABASE = os.getenv("DB_DATABASE")
 DB_PORT = int(os.getenv("DB_PORT", 3306))
 
-# Fonction de connexion
+# URL SQLAlchemy complète (optionnelle) : remplace MySQL pour l'API,
+# ex. sqlite:///bench.db pour les benchmarks sur base de substitution
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+# Délais (secondes) : une base lente ou injoignable échoue vite au lieu de bloquer
+DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", 5))
+DB_READ_TIMEOUT = int(os.getenv("DB_READ_TIMEOUT", 30))
+DB_WRITE_TIMEOUT = int(os.getenv("DB_WRITE_TIMEOUT", 30))
+
+# Nouvelles tentatives de connexion (bornées, attente exponentielle + aléa)
+DB_CONNECT_RETRIES = int(os.getenv("DB_CONNECT_RETRIES", 2))
+DB_RETRY_BACKOFF = float(os.getenv("DB_RETRY_BACKOFF", 0.2))
+
+# Disjoncteur : après N échecs consécutifs, 503 immédiat pendant DB_BREAKER_RESET s
+DB_BREAKER_THRESHOLD = int(os.getenv("DB_BREAKER_THRESHOLD", 3))
+DB_BREAKER_RESET = float(os.getenv("DB_BREAKER_RESET", 15))
+
+
+def _connect():
+    """pymysql.connect avec délais et nouvelles tentatives ; lève l'erreur finale."""
+    import pymysql
+
+    for attempt in range(DB_CONNECT_RETRIES + 1):
+        try:
+            return pymysql.connect(
+                host=DB_HOST,
+                user=DB_USER,
+                password=DB_PASSWORD,
+                database=DB_DATABASE,
+                port=DB_PORT,
+                connect_timeout=DB_CONNECT_TIMEOUT,
+                read_timeout=DB_READ_TIMEOUT,
+                write_timeout=DB_WRITE_TIMEOUT
+            )
+        except pymysql.err.OperationalError:
+            if attempt == DB_CONNECT_RETRIES:
+                raise
+            # Aléa pour éviter que tous les workers retentent au même instant
+            time.sleep(DB_RETRY_BACKOFF * 2 ** attempt * random.uniform(0.5, 1.5))
+
+
+# Fonction de connexion : lève l'erreur (jamais None) pour que l'appelant s'arrête net
 def get_connection():
     try:
-        conn = pymysql.connect(
-            host=DB_HOST,
-            user=DB_USER,
-            password=DB_PASSWORD,
-            database=DB_DATABASE,
-            port=DB_PORT
-        )
-        print("✅ Connexion réussie à la base de données MySQL !")
-        return conn
+        conn = _connect()
     except Exception as e:
         print("❌ Erreur de connexion :", e)
-        return None
+        raise
+    print("✅ Connexion réussie à la base de données MySQL !")
+    return conn
+
+
+# Engine SQLAlchemy partagé (pool de connexions réutilisé entre les requêtes)
+_engine = None
+
+def get_engine():
+    global _engine
+    if _engine is None:
+        from sqlalchemy import create_engine
+        from sqlalchemy.engine import URL
+
+        if DATABASE_URL:
+            _engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+        else:
+            # Le pool ouvre ses connexions via _connect (délais + nouvelles tentatives)
+            _engine = create_engine(
+                URL.create("mysql+pymysql"),
+                creator=_connect,
+                pool_pre_ping=True,
+                pool_timeout=DB_CONNECT_TIMEOUT
+            )
+    return _engine
+
+
+# Codes client MySQL de perte de connexion : can't connect (2003), server has gone
+# away (2006), lost connection during query (2013) / at reading (2055)
+CONNECTIVITY_ERRNOS = {2003, 2006, 2013, 2055}
+
+
+def is_connectivity_error(error: Exception) -> bool:
+    """Pertes de connexion uniquement : elles seules ouvrent le circuit.
+
+    Les erreurs SQL (colonne inconnue 1054, lock wait timeout 1205, deadlock 1213,
+    "no such column" sqlite...) prouvent que la base répond : elles remontent telles quelles.
+    """
+    from sqlalchemy import exc
+
+    # Pool saturé : aucune connexion obtenue dans pool_timeout
+    if isinstance(error, exc.TimeoutError):
+        return True
+    if isinstance(error, exc.DBAPIError) and error.connection_invalidated:
+        return True
+
+    # Erreur pymysql brute ou enveloppée par SQLAlchemy (.orig)
+    args = getattr(getattr(error, "orig", None) or error, "args", ())
+    return bool(args) and args[0] in CONNECTIVITY_ERRNOS
+
+
+db_breaker = CircuitBreaker(
+    failure_threshold=DB_BREAKER_THRESHOLD,
+    reset_timeout=DB_BREAKER_RESET,
+    is_failure=is_connectivity_error
+)
+
+
+def db_call(fn):
+    """Exécute fn() derrière le disjoncteur ; lève DatabaseUnavailable si la base est indisponible."""
+    return db_breaker.call(fn)
 
 
 # Test direct
 if __name__ == "__main__":
     connexion = get_connection()
-    if connexion:
-        cursor = connexion.cursor()
-        cursor.execute("SHOW DATABASES;")
-        print("📦 Bases disponibles :", cursor.fetchall())
-        connexion.close()
-        print("🔒 Connexion fermée.")
+    cursor = connexion.cursor()
+    cursor.execute("SHOW DATABASES;")
+    print("📦 Bases disponibles :", cursor.fetchall())
+    connexion.close()
+    print("🔒 Connexion fermée.")
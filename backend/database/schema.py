@@ -0,0 +1,169 @@
+import uuid
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+
+# =========================================================
+# 🧑‍🤝‍🧑 Participants des résultats
+# =========================================================
+# Remplace la colonne JSON results.athletes : une ligne par athlète et par
+# résultat, indexée sur l'athlète pour les historiques et décomptes.
+RESULTS_ATHLETES_DDL = """
+    CREATE TABLE IF NOT EXISTS results_athletes (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        result_id INT NOT NULL,
+        athlete_full_name VARCHAR(255),
+        athlete_url VARCHAR(255),
+        INDEX idx_results_athletes_url (athlete_url),
+        INDEX idx_results_athletes_name (athlete_full_name),
+        CONSTRAINT fk_results_athletes_result
+            FOREIGN KEY (result_id) REFERENCES results (id) ON DELETE CASCADE
+    )
+"""
+
+
+# =========================================================
+# 🗺️ Dimensions pays / éditions (clés entières)
+# =========================================================
+# Construites après chaque import (scripts/dimensions.py) : les tables de
+# faits portent country_id / game_id, les jointures et regroupements se font
+# sur des entiers plutôt que sur des chaînes normalisées à la volée.
+COUNTRIES_DDL = """
+    CREATE TABLE IF NOT EXISTS countries (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        country_name VARCHAR(100) NOT NULL,
+        country_3_letter_code VARCHAR(3),
+        UNIQUE KEY uq_countries_name (country_name)
+    )
+"""
+
+# Graphies normalisées (nom sans espaces/tirets, code à 3 lettres) → pays
+COUNTRY_ALIASES_DDL = """
+    CREATE TABLE IF NOT EXISTS country_aliases (
+        alias_key VARCHAR(150) PRIMARY KEY,
+        country_id INT NOT NULL,
+        INDEX idx_country_aliases_country (country_id),
+        CONSTRAINT fk_country_aliases_country
+            FOREIGN KEY (country_id) REFERENCES countries (id) ON DELETE CASCADE
+    )
+"""
+
+GAMES_DDL = """
+    CREATE TABLE IF NOT EXISTS games (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        game_key VARCHAR(150) NOT NULL,
+        game_slug VARCHAR(150) NOT NULL,
+        game_name VARCHAR(150),
+        game_year SMALLINT,
+        game_season VARCHAR(10),
+        UNIQUE KEY uq_games_key (game_key),
+        INDEX idx_games_year_season (game_year, game_season)
+    )
+"""
+
+# Colonnes de clés ajoutées aux tables de faits : (table, colonne, index)
+FACT_KEY_COLUMNS = [
+    ("hosts", "game_id", "idx_hosts_game"),
+    ("medals", "game_id", "idx_medals_game_country"),
+    ("medals", "country_id", "idx_medals_country"),
+    ("results", "game_id", "idx_results_game_country"),
+    ("results", "country_id", "idx_results_country"),
+]
+
+FACT_KEY_INDEXES = {
+    "idx_hosts_game": "(game_id)",
+    "idx_medals_game_country": "(game_id, country_id)",
+    "idx_medals_country": "(country_id)",
+    "idx_results_game_country": "(game_id, country_id)",
+    "idx_results_country": "(country_id)",
+}
+
+
+def ensure_fact_keys(cursor):
+    """Ajoute country_id / game_id (+ index) aux tables de faits si absents."""
+    cursor.execute("""
+        SELECT TABLE_NAME, COLUMN_NAME FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE()
+    """)
+    columns = set(cursor.fetchall())
+    cursor.execute("""
+        SELECT DISTINCT TABLE_NAME, INDEX_NAME FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE()
+    """)
+    indexes = set(cursor.fetchall())
+
+    for table, column, index in FACT_KEY_COLUMNS:
+        if (table, column) not in columns:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} INT NULL")
+        if (table, index) not in indexes:
+            cursor.execute(f"CREATE INDEX {index} ON {table} {FACT_KEY_INDEXES[index]}")
+            indexes.add((table, index))
+
+
+# =========================================================
+# 🏅 Tableaux des médailles par édition
+# =========================================================
+# Recalculés à chaque import (scripts/medal_tables.py) ; l'index
+# (game_id, medal_rank) sert directement /api/games/<slug>/medal-table.
+MEDAL_TABLES_DDL = """
+    CREATE TABLE IF NOT EXISTS medal_tables (
+        game_id INT NOT NULL,
+        country_id INT NOT NULL,
+        gold SMALLINT NOT NULL,
+        silver SMALLINT NOT NULL,
+        bronze SMALLINT NOT NULL,
+        total SMALLINT NOT NULL,
+        medal_rank SMALLINT NOT NULL,
+        PRIMARY KEY (game_id, country_id),
+        INDEX idx_medal_tables_rank (game_id, medal_rank)
+    )
+"""
+
+
+# =========================================================
+# 🔮 Prévisions de médailles (scoring batch)
+# =========================================================
+# Écrite par ml/model_country_forecast.py, lue telle quelle par le
+# leaderboard : l'index couvre le filtre par édition et le tri par rang.
+MEDAL_FORECASTS_DDL = """
+    CREATE TABLE IF NOT EXISTS medal_forecasts (
+        game_year SMALLINT NOT NULL,
+        game_season VARCHAR(10) NOT NULL,
+        country_name VARCHAR(100) NOT NULL,
+        predicted_medals INT NOT NULL,
+        predicted_rank INT NOT NULL,
+        scored_at DATETIME NOT NULL,
+        PRIMARY KEY (game_year, game_season, country_name),
+        INDEX idx_medal_forecasts_rank (game_year, game_season, predicted_rank)
+    )
+"""
+
+
+# =========================================================
+# 🏷️ Version d'import
+# =========================================================
+# Une seule ligne, réécrite à chaque import : l'API compare cette version
+# à celle de ses données en mémoire pour savoir quand les recharger.
+IMPORT_META_DDL = """
+    CREATE TABLE IF NOT EXISTS import_meta (
+        id TINYINT PRIMARY KEY,
+        version CHAR(32) NOT NULL,
+        imported_at DATETIME NOT NULL
+    )
+"""
+
+
+def bump_import_version(cursor):
+    cursor.execute(IMPORT_META_DDL)
+    cursor.execute(
+        "REPLACE INTO import_meta (id, version, imported_at) VALUES (1, %s, NOW())",
+        (uuid.uuid4().hex,)
+    )
+
+
+def get_import_version(engine):
+    try:
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT version FROM import_meta WHERE id = 1")).scalar()
+    except ProgrammingError:
+        # Table absente : base importée avant l'ajout du versioning
+        return None
@@ -0,0 +1,70 @@
+import csv
+import io
+import json
+from flask import Response, stream_with_context
+
+from config import EXPORT_CHUNK_SIZE
+from database.connexion import db_call, get_engine
+
+# Formats supportés → type MIME de la réponse
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson; charset=utf-8",
+}
+
+
+def _iter_csv(columns, chunks):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+
+    for rows in chunks:
+        buffer.seek(0)
+        buffer.truncate(0)
+        writer.writerows(rows)
+        yield buffer.getvalue()
+
+
+def _iter_ndjson(columns, chunks):
+    for rows in chunks:
+        yield "".join(
+            json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=str) + "\n"
+            for row in rows
+        )
+
+
+def _iter_export(query, params, fmt, chunk_size):
+    # stream_results → curseur serveur (SSCursor) : les lignes ne sont jamais
+    # bufferisées en entier, ni côté driver ni côté Python.
+    from sqlalchemy import text
+
+    with get_engine().connect() as conn:
+        result = conn.execution_options(stream_results=True).execute(text(query), params)
+        columns = list(result.keys())
+        chunks = result.partitions(chunk_size)
+
+        writer = _iter_csv if fmt == "csv" else _iter_ndjson
+        yield from writer(columns, chunks)
+
+
+def stream_query(query: str, params: dict, fmt: str, filename: str) -> Response:
+    """Exporte le résultat d'une requête SQL en CSV / NDJSON, paquet par paquet."""
+    rows = _iter_export(query, params, fmt, EXPORT_CHUNK_SIZE)
+
+    # On exécute la requête avant d'envoyer les en-têtes pour qu'une erreur
+    # SQL remonte en vraie erreur HTTP plutôt qu'en flux tronqué.
+    first = db_call(lambda: next(rows, ""))
+
+    def generate():
+        try:
+            yield first
+            yield from rows
+        finally:
+            rows.close()
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f"attachment; filename={filename}.{fmt}"},
+    )
@@ -0,0 +1,159 @@
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+from database.connexion import db_call, get_engine
+from database.schema import get_import_version
+
+
+# =========================================================
+# 🧠 Données servies depuis la mémoire
+# =========================================================
+# Le dataset ne change qu'entre deux imports : en mode SERVE_FROM_MEMORY,
+# hosts / results / athletes (projetés) sont chargés une fois en DataFrames
+# typés, et les endpoints de lecture ne touchent plus MySQL.
+
+HOSTS_QUERY = "SELECT game_slug, game_name, game_year, game_season, game_location FROM hosts"
+RESULTS_QUERY = "SELECT country_name, discipline_title, medal_type, slug_game, event_title FROM results"
+ATHLETES_QUERY = "SELECT athlete_full_name, games_participations, athlete_year_birth FROM athletes"
+
+
+def _categorize(df: pd.DataFrame, cols: list[str]) -> pd.DataFrame:
+    for c in cols:
+        df[c] = df[c].astype("category")
+    return df
+
+
+def _match_positions(index: dict, needle: str) -> np.ndarray:
+    """Positions des lignes dont la catégorie contient `needle` (insensible à la casse)."""
+    needle = needle.lower()
+    hits = [pos for value, pos in index.items() if needle in str(value).lower()]
+    if not hits:
+        return np.empty(0, dtype=np.intp)
+    return np.concatenate(hits)
+
+
+class MemoryStore:
+    def __init__(self, refresh_seconds: int = 60):
+        self.refresh_seconds = refresh_seconds
+        self.version = None
+        self.loaded_at = None
+        self.last_error = None
+        self._data = None
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._data is not None
+
+    # === Chargement ===
+    def load(self):
+        engine = get_engine()
+        version = get_import_version(engine)
+
+        hosts = pd.read_sql(HOSTS_QUERY, engine)
+        hosts["game_year"] = pd.to_numeric(hosts["game_year"], downcast="integer")
+        hosts = _categorize(hosts, ["game_season", "game_location"])
+        hosts = hosts.sort_values("game_year", ascending=False, kind="mergesort").reset_index(drop=True)
+
+        results = pd.read_sql(RESULTS_QUERY, engine)
+        results = _categorize(results, list(results.columns))
+
+        athletes = pd.read_sql(ATHLETES_QUERY, engine)
+        athletes["games_participations"] = pd.to_numeric(athletes["games_participations"], downcast="integer")
+        athletes["athlete_year_birth"] = pd.to_numeric(athletes["athlete_year_birth"], downcast="float")
+
+        data = {
+            "frames": {"hosts": hosts, "results": results, "athletes": athletes},
+            # Index de groupes : catégorie → positions des lignes
+            "results_by_country": results.groupby("country_name", observed=True).indices,
+            "results_by_game": results.groupby("slug_game", observed=True).indices,
+            "top_athletes": (
+                athletes.sort_values("games_participations", ascending=False, kind="mergesort")
+                .head(100)
+                .to_dict(orient="records")
+            ),
+            "overview": {
+                "totalMedals": int(len(results)),
+                "totalAthletes": int(athletes["athlete_full_name"].nunique()),
+                "totalCountries": int(results["country_name"].nunique()),
+                "totalEvents": int(results["event_title"].nunique()),
+            },
+        }
+
+        # Remplacement atomique : les requêtes en cours gardent l'ancien jeu
+        with self._lock:
+            self._data = data
+            self.version = version
+            self.loaded_at = time.time()
+            self.last_error = None
+        print(f"🧠 Données chargées en mémoire (version d'import {version})")
+
+    def refresh_if_changed(self):
+        version = db_call(lambda: get_import_version(get_engine()))
+        if version != self.version or not self.ready:
+            db_call(self.load)
+
+    def start(self):
+        try:
+            db_call(self.load)
+        except Exception as e:
+            self.last_error = str(e)
+            print("⚠️ Chargement mémoire impossible, repli sur MySQL :", e)
+
+        thread = threading.Thread(target=self._refresh_loop, name="memory-store-refresh", daemon=True)
+        thread.start()
+
+    def _refresh_loop(self):
+        while True:
+            time.sleep(self.refresh_seconds)
+            try:
+                self.refresh_if_changed()
+            except Exception as e:
+                # Base indisponible : on continue de servir les données en mémoire
+                self.last_error = str(e)
+
+    # === Lectures ===
+    def games(self, season=None) -> pd.DataFrame:
+        hosts = self._data["frames"]["hosts"]
+        if season:
+            hosts = hosts[hosts["game_season"].str.lower() == season.lower()]
+        return hosts
+
+    def results(self, country=None, game=None, season=None) -> pd.DataFrame:
+        data = self._data
+        df = data["frames"]["results"]
+
+        positions = None
+        for index, needle in (
+            (data["results_by_country"], country),
+            (data["results_by_game"], game),
+            (data["results_by_game"], season),
+        ):
+            if not needle:
+                continue
+            hits = _match_positions(index, needle)
+            positions = hits if positions is None else np.intersect1d(positions, hits)
+
+        if positions is None:
+            return df
+        return df.iloc[np.sort(positions)]
+
+    def top_athletes(self) -> list:
+        return self._data["top_athletes"]
+
+    def overview(self) -> dict:
+        return self._data["overview"]
+
+    def report(self) -> dict:
+        frames = self._data["frames"] if self.ready else {}
+        return {
+            "ready": self.ready,
+            "version": self.version,
+            "loaded_at": self.loaded_at,
+            "last_error": self.last_error,
+            "memory_bytes": {
+                name: int(df.memory_usage(deep=True).sum()) for name, df in frames.items()
+            },
+        }
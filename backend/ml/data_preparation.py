@@ -1,41 +1,27 @@
 import pandas as pd
-from sqlalchemy import create_engine
 
 import os
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from database.connexion import get_connection
-
-
-def normalize_key(x):
-    if isinstance(x, str):
-        return x.strip().lower().replace(" ", "").replace("-", "")
-    return x
+from database.connexion import get_engine
 
 
 def load_data():
-    conn = get_connection()
-
-    engine = create_engine(
-        f"mysql+pymysql://{conn.user.decode()}:{conn.password.decode()}@{conn.host}:{conn.port}/{conn.db.decode()}"
-    )
+    engine = get_engine()
 
+    # Clés entières posées par l'import (scripts/dimensions.py) : plus de
+    # normalisation de chaînes ligne à ligne pour aligner les jointures
     print("🔄 Chargement des tables...")
-    hosts = pd.read_sql("SELECT * FROM hosts", engine)
-    athletes = pd.read_sql("SELECT * FROM athletes", engine)
-    results = pd.read_sql("SELECT * FROM results", engine)
-    medals = pd.read_sql("SELECT * FROM medals", engine)
+    games = pd.read_sql("SELECT id AS game_id, game_year, game_season FROM games", engine)
+    countries = pd.read_sql("SELECT id AS country_id, country_name FROM countries", engine)
+    results = pd.read_sql("SELECT country_id, game_id, medal_type FROM results", engine)
+    medals = pd.read_sql("SELECT country_id, game_id, medal_type FROM medals", engine)
     print("✅ Données chargées !")
 
-    # Normalisation des clés
-    results["slug_game_clean"] = results["slug_game"].apply(normalize_key)
-    medals["slug_game_clean"] = medals["slug_game"].apply(normalize_key)
-    hosts["game_slug_clean"] = hosts["game_slug"].apply(normalize_key)
-
     # === Fusion results + medals ===
     merged = results.merge(
-        medals[["country_name", "slug_game_clean", "medal_type"]],
-        on=["country_name", "slug_game_clean"],
+        medals,
+        on=["country_id", "game_id"],
         how="left",
         suffixes=("_results", "_medals")
     )
@@ -43,13 +29,8 @@ def load_data():
     # === Unifier les colonnes de médaille ===
     merged["medal_type"] = merged["medal_type_results"].combine_first(merged["medal_type_medals"])
 
-    # === Fusion avec hosts ===
-    merged = merged.merge(
-        hosts[["game_slug_clean", "game_year", "game_season"]],
-        left_on="slug_game_clean",
-        right_on="game_slug_clean",
-        how="left"
-    )
+    # === Fusion avec games ===
+    merged = merged.merge(games, on="game_id", how="left")
 
     print(f"✅ Fusion réussie : {len(merged)} lignes après jointures")
 
@@ -59,11 +40,16 @@ def load_data():
 
     # === Agrégation ===
     dataset = (
-        merged.groupby(["country_name", "game_year", "game_season"])["medal_type"]
+        merged.groupby(["country_id", "game_year", "game_season"])["medal_type"]
         .count()
         .reset_index()
         .rename(columns={"medal_type": "total_medals"})
     )
+    dataset = (
+        countries.merge(dataset, on="country_id")
+        .drop(columns="country_id")
+        .sort_values(["country_name", "game_year", "game_season"], kind="mergesort", ignore_index=True)
+    )
 
     # Nettoyage
     dataset = dataset[dataset["game_year"].notna()]
@@ -3,84 +3,169 @@ import pandas as pd
 import numpy as np
 import os
 import json
+import argparse
+import time
+import tracemalloc
+from contextlib import contextmanager
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, confusion_matrix
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import confusion_matrix
 import joblib
-from sqlalchemy import create_engine
+from sqlalchemy import text
 
-import os
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from database.connexion import get_connection
+from database.connexion import get_engine
+
+# Projection : seules les colonnes utiles sont lues (ni bio, ni texte des médailles)
+ATHLETES_QUERY = """
+    SELECT games_participations, athlete_year_birth, athlete_medals IS NOT NULL AS has_medal
+    FROM athletes
+"""
+
+CHUNK_SIZE = 50_000
+TEST_RATIO = 0.2
+SEED = 42
+
+
+# === 0. Suivi mémoire par phase ===
+class MemoryReport:
+    """Pic mémoire Python (tracemalloc, allocations numpy comprises) de chaque phase."""
+
+    def __init__(self):
+        self.phases = {}
+        tracemalloc.start()
+
+    @contextmanager
+    def phase(self, name):
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        yield
+        _, peak = tracemalloc.get_traced_memory()
+        seconds = time.perf_counter() - start
+        self.phases[name] = {"peak_mb": round(peak / 1024 ** 2, 2), "seconds": round(seconds, 2)}
+        print(f"📏 {name} : pic mémoire {peak / 1024 ** 2:.1f} Mo en {seconds:.1f}s")
+
 
-# === 1. Chargement des données ===
-def load_athletes_data():
-    conn = get_connection()
-    engine = create_engine(
-        f"mysql+pymysql://{conn.user.decode()}:{conn.password.decode()}@{conn.host}:{conn.port}/{conn.db.decode()}"
-    )
+# === 1. Chargement des données (par paquets) ===
+def iter_athlete_chunks(chunk_size=CHUNK_SIZE):
+    # stream_results → curseur serveur : la table n'est jamais chargée en entier
+    with get_engine().connect() as conn:
+        conn = conn.execution_options(stream_results=True)
+        for chunk in pd.read_sql(text(ATHLETES_QUERY), conn, chunksize=chunk_size):
+            yield prepare_dataset(chunk)
 
-    print("📥 Chargement de la table athletes depuis la base MySQL...")
-    athletes = pd.read_sql("SELECT * FROM athletes", engine)
-    print(f"✅ {len(athletes)} lignes chargées depuis la table athletes")
 
-    return athletes
+def load_athletes_data(chunk_size=CHUNK_SIZE):
+    print("📥 Chargement des colonnes utiles de la table athletes depuis la base MySQL...")
+    parts = list(iter_athlete_chunks(chunk_size))
+    X = pd.concat([X for X, _ in parts], ignore_index=True)
+    y = pd.concat([y for _, y in parts], ignore_index=True)
+    print(f"✅ {len(X)} lignes exploitables chargées depuis la table athletes")
+
+    return X, y
 
 
 # === 2. Préparation du dataset ===
 def prepare_dataset(df):
-    # Création d'une variable cible (1 = a une médaille, 0 = aucune)
-    df["has_medal"] = df["athlete_medals"].notnull().astype(int)
+    # Variable cible (1 = a une médaille, 0 = aucune), calculée par MySQL
+    target = pd.to_numeric(df["has_medal"], errors="coerce").fillna(0).astype(np.int8)
 
-    # Nettoyage et sélection des variables utiles
-    df["athlete_year_birth"] = pd.to_numeric(df["athlete_year_birth"], errors="coerce")
-    df["games_participations"] = pd.to_numeric(df["games_participations"], errors="coerce")
-    df["athlete_medals"] = df["athlete_medals"].fillna("0")
+    birth = pd.to_numeric(df["athlete_year_birth"], errors="coerce")
+    participations = pd.to_numeric(df["games_participations"], errors="coerce")
 
     # On enlève les lignes sans âge ni participation
-    df = df.dropna(subset=["athlete_year_birth", "games_participations"])
+    keep = (birth.notna() & participations.notna()).to_numpy()
 
     # Création d'une variable "age_approx" basée sur l'année du premier jeu
     current_year = 2024
-    df["athlete_age"] = current_year - df["athlete_year_birth"]
-
-    features = df[["games_participations", "athlete_age"]]
-    target = df["has_medal"]
+    features = pd.DataFrame({
+        "games_participations": participations[keep].astype(np.float32),
+        "athlete_age": (current_year - birth[keep]).astype(np.float32),
+    })
 
-    return features, target
+    return features, target[keep]
 
 
 # === 3. Entraînement du modèle ===
+def report_metrics(cm):
+    tn, fp, fn, tp = (int(v) for v in cm.ravel())
+    acc = (tp + tn) / max(tn + fp + fn + tp, 1)
+    prec = tp / (tp + fp) if tp + fp else 0.0
+    rec = tp / (tp + fn) if tp + fn else 0.0
+    f1 = 2 * prec * rec / (prec + rec) if prec + rec else 0.0
+
+    print("\n📊 Évaluation du modèle :")
+    print(f"✅ Accuracy : {acc:.3f}")
+    print(f"✅ Précision : {prec:.3f}")
+    print(f"✅ Rappel : {rec:.3f}")
+    print(f"✅ F1-score : {f1:.3f}")
+    print("\nMatrice de confusion :")
+    print(cm)
+
+    return {"accuracy": acc, "precision": prec, "recall": rec, "f1": f1}
+
+
 def train_model(X, y):
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=TEST_RATIO, random_state=SEED)
 
     scaler = StandardScaler()
     X_train_scaled = scaler.fit_transform(X_train)
     X_test_scaled = scaler.transform(X_test)
 
-    model = RandomForestClassifier(random_state=42, n_estimators=100)
+    model = RandomForestClassifier(random_state=SEED, n_estimators=100)
     model.fit(X_train_scaled, y_train)
 
     y_pred = model.predict(X_test_scaled)
 
     # Évaluation
-    acc = accuracy_score(y_test, y_pred)
-    prec = precision_score(y_test, y_pred)
-    rec = recall_score(y_test, y_pred)
-    f1 = f1_score(y_test, y_pred)
-    cm = confusion_matrix(y_test, y_pred)
+    return model, scaler, report_metrics(confusion_matrix(y_test, y_pred, labels=[0, 1]))
 
-    print("\n📊 Évaluation du modèle :")
-    print(f"✅ Accuracy : {acc:.3f}")
-    print(f"✅ Précision : {prec:.3f}")
-    print(f"✅ Rappel : {rec:.3f}")
-    print(f"✅ F1-score : {f1:.3f}")
-    print("\nMatrice de confusion :")
-    print(cm)
 
-    return model, scaler, {"accuracy": acc, "precision": prec, "recall": rec, "f1": f1}
+def split_mask(chunk_index, n):
+    """Masque test déterministe par paquet : identique à chaque passe sur la table."""
+    rng = np.random.default_rng([SEED, chunk_index])
+    return rng.random(n) < TEST_RATIO
+
+
+def train_incremental(memory, chunk_size=CHUNK_SIZE, epochs=3):
+    """Apprentissage hors mémoire : seuls `chunk_size` athlètes sont en RAM à la fois.
+
+    Passe 1 : moyenne / écart-type (StandardScaler.partial_fit) sur les lignes d'entraînement.
+    Passes 2..epochs+1 : SGDClassifier(log_loss).partial_fit (predict_proba disponible pour l'API).
+    Dernière passe : matrice de confusion cumulée sur les lignes de test.
+    """
+    scaler = StandardScaler()
+    model = SGDClassifier(loss="log_loss", random_state=SEED)
+
+    with memory.phase("normalisation"):
+        rows = 0
+        for i, (X, y) in enumerate(iter_athlete_chunks(chunk_size)):
+            train = ~split_mask(i, len(X))
+            if train.any():
+                scaler.partial_fit(X[train])
+            rows += len(X)
+        print(f"✅ {rows} lignes exploitables dans la table athletes")
+
+    with memory.phase("entraînement"):
+        for epoch in range(epochs):
+            for i, (X, y) in enumerate(iter_athlete_chunks(chunk_size)):
+                train = ~split_mask(i, len(X))
+                if train.any():
+                    model.partial_fit(scaler.transform(X[train]), y[train], classes=[0, 1])
+            print(f"🔁 Époque {epoch + 1}/{epochs} terminée")
+
+    with memory.phase("évaluation"):
+        cm = np.zeros((2, 2), dtype=np.int64)
+        for i, (X, y) in enumerate(iter_athlete_chunks(chunk_size)):
+            test = split_mask(i, len(X))
+            if test.any():
+                y_pred = model.predict(scaler.transform(X[test]))
+                cm += confusion_matrix(y[test], y_pred, labels=[0, 1])
+
+    return model, scaler, report_metrics(cm)
 
 
 # === 4. Sauvegarde du modèle et des métriques ===
@@ -101,8 +186,26 @@ def save_outputs(model, scaler, metrics):
 
 # === 5. Pipeline complet ===
 if __name__ == "__main__":
-    df = load_athletes_data()
-    X, y = prepare_dataset(df)
-    model, scaler, metrics = train_model(X, y)
-    save_outputs(model, scaler, metrics)
+    parser = argparse.ArgumentParser(description="Entraîne le modèle de probabilité de médaille d'un athlète")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Apprentissage hors mémoire par paquets (SGDClassifier) au lieu de la forêt aléatoire")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Athlètes lus par paquet")
+    parser.add_argument("--epochs", type=int, default=3, help="Passes d'apprentissage (mode --incremental)")
+    args = parser.parse_args()
+
+    memory = MemoryReport()
+    if args.incremental:
+        model, scaler, metrics = train_incremental(memory, args.chunk_size, args.epochs)
+    else:
+        with memory.phase("chargement"):
+            X, y = load_athletes_data(args.chunk_size)
+        with memory.phase("entraînement"):
+            model, scaler, metrics = train_model(X, y)
+
+    metrics["training"] = {
+        "mode": "incremental" if args.incremental else "in_memory",
+        "memory": memory.phases,
+    }
+    with memory.phase("sauvegarde"):
+        save_outputs(model, scaler, metrics)
     print("\n🏁 Entraînement terminé avec succès !")
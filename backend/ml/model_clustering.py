@@ -4,7 +4,6 @@ import numpy as np
 import os
 from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler
-import matplotlib.pyplot as plt
 
 # === 1. Chargement du dataset préparé ===
 DATA_PATH = "ml/output/dataset_prepared.csv"
@@ -31,14 +30,21 @@ for k in K_range:
     kmeans.fit(X_scaled)
     inertias.append(kmeans.inertia_)
 
-plt.figure(figsize=(7, 5))
-plt.plot(K_range, inertias, marker="o")
-plt.title("Méthode du coude pour déterminer le nombre optimal de clusters")
-plt.xlabel("Nombre de clusters (k)")
-plt.ylabel("Inertie (Within Sum of Squares)")
-plt.grid(True)
-plt.tight_layout()
-plt.show()
+# Graphique du coude : matplotlib n'est importé que s'il peut s'afficher
+# (en batch, ex. ml/pipeline.py avec MPLBACKEND=Agg, plt.show() ne fait rien)
+if os.environ.get("MPLBACKEND", "").lower() != "agg":
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(7, 5))
+    plt.plot(K_range, inertias, marker="o")
+    plt.title("Méthode du coude pour déterminer le nombre optimal de clusters")
+    plt.xlabel("Nombre de clusters (k)")
+    plt.ylabel("Inertie (Within Sum of Squares)")
+    plt.grid(True)
+    plt.tight_layout()
+    plt.show()
+else:
+    print("📉 Inerties (méthode du coude) :", dict(zip(K_range, [round(i, 1) for i in inertias])))
 
 # === 4. Choix du nombre de clusters (ajuste si besoin) ===
 best_k = 4  # valeur ajustable selon le graphique du coude
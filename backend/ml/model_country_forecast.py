@@ -0,0 +1,194 @@
+# Prévision du tableau des médailles : score de tous les pays pour les prochains Jeux
+import pandas as pd
+import numpy as np
+import json
+import os
+import sys
+import argparse
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.preprocessing import LabelEncoder
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+import joblib
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from database.connexion import get_connection
+from database.schema import MEDAL_FORECASTS_DDL
+
+DATA_PATH = "ml/output/dataset_prepared.csv"
+OUTPUT_DIR = "ml/output"
+
+# Prochaines éditions scorées par défaut (surchargeable via --games 2028:Summer ...)
+UPCOMING_GAMES = [(2026, "Winter"), (2028, "Summer"), (2030, "Winter"), (2032, "Summer")]
+
+# Éditions les plus récentes de chaque saison réservées à l'évaluation
+HOLDOUT_EDITIONS = 2
+
+# Pays absents depuis plus longtemps (délégations disparues) : non scorés
+ACTIVE_WINDOW_YEARS = 8
+
+FEATURES = [
+    "game_year", "season_encoded", "country_encoded",
+    "prev_medals", "mean_last3", "editions",
+]
+
+
+# === 1. Features par pays ===
+def add_history_features(df):
+    """Historique du pays sur les éditions précédentes de la même saison."""
+    df = df.sort_values(["country_name", "game_season", "game_year"]).copy()
+    past = df.groupby(["country_name", "game_season"])["total_medals"]
+
+    df["prev_medals"] = past.shift(1)
+    df["mean_last3"] = past.transform(lambda s: s.shift(1).rolling(3, min_periods=1).mean())
+    df["editions"] = df.groupby(["country_name", "game_season"]).cumcount()
+    return df
+
+
+def latest_history(df):
+    """Dernier état connu de chaque pays et saison, base des prévisions."""
+    df = df.sort_values(["country_name", "game_season", "game_year"])
+    grouped = df.groupby(["country_name", "game_season"])["total_medals"]
+    history = pd.DataFrame({
+        "prev_medals": grouped.last(),
+        "mean_last3": grouped.apply(lambda s: s.tail(3).mean()),
+        "editions": grouped.size(),
+        "last_year": df.groupby(["country_name", "game_season"])["game_year"].max(),
+    }).reset_index()
+
+    season_last = history.groupby("game_season")["last_year"].transform("max")
+    return history[history["last_year"] >= season_last - ACTIVE_WINDOW_YEARS]
+
+
+# === 2. Entraînement ===
+def train(df, encoder):
+    df = add_history_features(df)
+    df["country_encoded"] = encoder.transform(df["country_name"])
+
+    # Première participation : pas d'historique exploitable
+    train_df = df.dropna(subset=["prev_medals", "total_medals"])
+    X = train_df[FEATURES]
+    y = train_df["total_medals"]
+
+    # Découpage temporel : on évalue sur les dernières éditions de chaque saison,
+    # apprises uniquement à partir des précédentes (comme une vraie prévision)
+    test = holdout_mask(train_df)
+
+    model = RandomForestRegressor(random_state=42, n_estimators=200, n_jobs=-1)
+    model.fit(X[~test], y[~test])
+    y_pred = model.predict(X[test])
+
+    metrics = {
+        "MAE": mean_absolute_error(y[test], y_pred),
+        "RMSE": float(np.sqrt(mean_squared_error(y[test], y_pred))),
+        "R2": r2_score(y[test], y_pred),
+        "holdout_games": sorted(
+            f"{year}:{season}"
+            for year, season in train_df.loc[test, ["game_year", "game_season"]].drop_duplicates().itertuples(index=False)
+        ),
+    }
+    print(f"✅ RandomForest (pays) → MAE={metrics['MAE']:.2f}, RMSE={metrics['RMSE']:.2f}, R2={metrics['R2']:.3f} "
+          f"sur {metrics['holdout_games']}")
+
+    # Modèle final réentraîné sur toutes les éditions pour les prévisions
+    model.fit(X, y)
+    return model, metrics
+
+
+def holdout_mask(df):
+    """Lignes des HOLDOUT_EDITIONS dernières éditions de chaque saison."""
+    editions = df[["game_season", "game_year"]].drop_duplicates()
+    latest = editions.groupby("game_season")["game_year"].nlargest(HOLDOUT_EDITIONS).reset_index(level=0)
+    keys = set(zip(latest["game_season"], latest["game_year"]))
+    return pd.Series([k in keys for k in zip(df["game_season"], df["game_year"])], index=df.index)
+
+
+# === 3. Scoring batch ===
+def score_upcoming(df, model, encoder, games):
+    """Une ligne par (pays, édition à venir), prédite en un seul appel vectorisé."""
+    history = latest_history(df)
+
+    upcoming = pd.DataFrame(games, columns=["game_year", "game_season"])
+    grid = history.merge(upcoming, on="game_season", how="inner")
+    grid["season_encoded"] = grid["game_season"].map({"Summer": 0, "Winter": 1}).fillna(0)
+    grid["country_encoded"] = encoder.transform(grid["country_name"])
+
+    grid["predicted_medals"] = np.maximum(0, np.round(model.predict(grid[FEATURES]))).astype(int)
+    grid["predicted_rank"] = (
+        grid.groupby(["game_year", "game_season"])["predicted_medals"]
+        .rank(method="min", ascending=False)
+        .astype(int)
+    )
+
+    return grid.sort_values(["game_year", "game_season", "predicted_rank"])[
+        ["game_year", "game_season", "country_name", "predicted_medals", "predicted_rank"]
+    ]
+
+
+# === 4. Sauvegarde en base ===
+def save_forecasts(forecasts):
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(MEDAL_FORECASTS_DDL)
+
+    # Remplacement complet des éditions rescorées
+    for year, season in forecasts[["game_year", "game_season"]].drop_duplicates().itertuples(index=False):
+        cursor.execute(
+            "DELETE FROM medal_forecasts WHERE game_year = %s AND game_season = %s",
+            (int(year), season)
+        )
+
+    rows = [
+        (int(r.game_year), r.game_season, r.country_name, int(r.predicted_medals), int(r.predicted_rank))
+        for r in forecasts.itertuples(index=False)
+    ]
+    cursor.executemany("""
+        INSERT INTO medal_forecasts (game_year, game_season, country_name, predicted_medals, predicted_rank, scored_at)
+        VALUES (%s, %s, %s, %s, %s, NOW())
+    """, rows)
+
+    conn.commit()
+    cursor.close()
+    conn.close()
+    print(f"💾 {len(rows)} prévisions enregistrées dans la table medal_forecasts")
+
+
+def parse_games(values):
+    games = []
+    for v in values:
+        year, season = v.split(":")
+        games.append((int(year), season.capitalize()))
+    return games
+
+
+# === 5. Pipeline complet ===
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prévision des médailles de tous les pays pour les prochains Jeux")
+    parser.add_argument("--games", nargs="*", help="Éditions à scorer, ex. 2028:Summer 2030:Winter")
+    parser.add_argument("--no-db", action="store_true", help="N'écrit que le CSV, sans toucher MySQL")
+    args = parser.parse_args()
+
+    games = parse_games(args.games) if args.games else UPCOMING_GAMES
+
+    print("📥 Chargement du dataset...")
+    df = pd.read_csv(DATA_PATH)
+    df = df.dropna(subset=["total_medals"])
+    print(f"✅ {len(df)} lignes chargées depuis {DATA_PATH}")
+
+    encoder = LabelEncoder().fit(df["country_name"])
+    model, metrics = train(df, encoder)
+
+    forecasts = score_upcoming(df, model, encoder, games)
+    print(f"📊 {len(forecasts)} prévisions ({forecasts['country_name'].nunique()} pays × {len(games)} éditions)")
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    joblib.dump(encoder, os.path.join(OUTPUT_DIR, "country_encoder.pkl"))
+    joblib.dump(model, os.path.join(OUTPUT_DIR, "country_forecast_model.pkl"))
+    with open(os.path.join(OUTPUT_DIR, "country_forecast_metrics.json"), "w") as f:
+        json.dump(metrics, f, indent=4)
+    forecasts.to_csv(os.path.join(OUTPUT_DIR, "medal_forecasts.csv"), index=False)
+    print("💾 Modèle, encodeur et prévisions sauvegardés dans", OUTPUT_DIR)
+
+    if not args.no_db:
+        save_forecasts(forecasts)
+
+    print("\n🏁 Scoring terminé avec succès !")
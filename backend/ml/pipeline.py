@@ -0,0 +1,289 @@
+# Orchestration des entraînements : DAG des étapes, cache par empreinte, exécution parallèle
+import argparse
+import hashlib
+import importlib.metadata
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(BACKEND_DIR)
+
+OUTPUT_DIR = os.path.join("ml", "output")
+CACHE_DIR = os.path.join("ml", ".pipeline_cache")
+MANIFEST_PATH = os.path.join(CACHE_DIR, "manifest.json")
+
+# Entrées conservées par étape dans le cache (les plus récentes)
+KEEP_ENTRIES = 3
+
+# Modules locaux importés par les scripts : les modifier invalide toutes les étapes
+SHARED_MODULES = ["database/connexion.py", "database/circuit_breaker.py", "database/schema.py", "utils.py"]
+
+# Bibliothèques dont la version change les modèles produits (ou leur format pickle)
+LIBRARIES = ["scikit-learn", "pandas", "numpy", "joblib"]
+
+
+# =========================================================
+# 🧱 Déclaration des étapes
+# =========================================================
+@dataclass
+class Stage:
+    name: str
+    script: str
+    outputs: list
+    deps: list = field(default_factory=list)
+    uses_db: bool = False
+
+    @property
+    def inputs(self):
+        """Fichiers produits par les étapes amont et lus par cette étape."""
+        return [path for dep in self.deps for path in STAGES[dep].outputs]
+
+
+def _out(name):
+    return os.path.join(OUTPUT_DIR, name)
+
+
+STAGES = {s.name: s for s in [
+    Stage("prepare", "ml/data_preparation.py",
+          outputs=[_out("dataset_prepared.csv")], uses_db=True),
+    Stage("medals", "ml/model_medals_prediction.py",
+          outputs=[_out("best_model.pkl"), _out("metrics_report.json")], deps=["prepare"]),
+    Stage("clustering", "ml/model_clustering.py",
+          outputs=[_out("clusters.csv")], deps=["prepare"]),
+    Stage("forecast", "ml/model_country_forecast.py",
+          outputs=[_out("country_encoder.pkl"), _out("country_forecast_model.pkl"),
+                   _out("country_forecast_metrics.json"), _out("medal_forecasts.csv")],
+          deps=["prepare"], uses_db=True),  # écrit medal_forecasts en base
+    # Le modèle athlète lit directement MySQL : indépendant de dataset_prepared.csv
+    Stage("athlete", "ml/model_athlete_medal.py",
+          outputs=[_out("athlete_model.pkl"), _out("athlete_scaler.pkl"), _out("athlete_metrics.json")],
+          uses_db=True),
+]}
+
+
+# =========================================================
+# 🔑 Empreintes
+# =========================================================
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def library_versions():
+    versions = []
+    for name in LIBRARIES:
+        try:
+            versions.append(f"{name}=={importlib.metadata.version(name)}")
+        except importlib.metadata.PackageNotFoundError:
+            versions.append(f"{name}==absent")
+    return versions
+
+
+def db_version():
+    """Version d'import MySQL (table import_meta) : change à chaque import."""
+    from database.connexion import get_engine
+    from database.schema import get_import_version
+
+    try:
+        return get_import_version(get_engine())
+    except Exception as e:
+        print(f"⚠️ Version de la base indisponible ({type(e).__name__}) : étapes DB relancées, hors cache")
+        return None
+
+
+def is_cacheable(stage, version):
+    """Sans version de base, une étape DB ne peut ni être reprise du cache ni y entrer."""
+    return not (stage.uses_db and version is None)
+
+
+def stage_key(stage, version, environment):
+    h = hashlib.sha256()
+    h.update(stage.name.encode())
+    h.update(file_hash(stage.script).encode())
+    for path in stage.inputs:
+        h.update(path.encode())
+        h.update((file_hash(path) if os.path.exists(path) else "missing").encode())
+    h.update(environment.encode())
+    if stage.uses_db:
+        h.update(f"db:{version}".encode())
+    return h.hexdigest()[:20]
+
+
+def environment_hash():
+    """Modules partagés + versions des bibliothèques, communs à toutes les étapes."""
+    h = hashlib.sha256()
+    for path in SHARED_MODULES:
+        h.update(path.encode())
+        h.update((file_hash(path) if os.path.exists(path) else "missing").encode())
+    for version in library_versions():
+        h.update(version.encode())
+    return h.hexdigest()
+
+
+# =========================================================
+# 🗃️ Cache des sorties
+# =========================================================
+def load_manifest():
+    if not os.path.exists(MANIFEST_PATH):
+        return {}
+    with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(manifest):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=4)
+
+
+def entry_dir(stage, key):
+    return os.path.join(CACHE_DIR, f"{stage.name}-{key}")
+
+
+def is_cached(stage, key):
+    src = entry_dir(stage, key)
+    return all(os.path.exists(os.path.join(src, os.path.basename(p))) for p in stage.outputs)
+
+
+def restore(stage, key):
+    """Remet en place les sorties d'une exécution passée (si elles ont changé depuis)."""
+    src = entry_dir(stage, key)
+    for path in stage.outputs:
+        cached = os.path.join(src, os.path.basename(path))
+        if not os.path.exists(path) or file_hash(path) != file_hash(cached):
+            shutil.copy2(cached, path)
+
+
+def store(stage, key, manifest):
+    dst = entry_dir(stage, key)
+    os.makedirs(dst, exist_ok=True)
+    for path in stage.outputs:
+        shutil.copy2(path, os.path.join(dst, os.path.basename(path)))
+
+    keys = [k for k in manifest.get(stage.name, []) if k != key] + [key]
+    for old in keys[:-KEEP_ENTRIES]:
+        shutil.rmtree(entry_dir(stage, old), ignore_errors=True)
+    manifest[stage.name] = keys[-KEEP_ENTRIES:]
+
+
+# =========================================================
+# 🚀 Exécution
+# =========================================================
+def run_stage(stage):
+    env = dict(os.environ, MPLBACKEND="Agg")  # plt.show() ne bloque pas hors notebook
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, stage.script],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    seconds = time.perf_counter() - start
+
+    log_path = os.path.join(CACHE_DIR, f"{stage.name}.log")
+    with open(log_path, "w", encoding="utf-8") as f:
+        f.write(proc.stdout)
+        f.write(proc.stderr)
+
+    missing = [p for p in stage.outputs if not os.path.exists(p)]
+    if proc.returncode != 0 or missing:
+        raise RuntimeError(f"code {proc.returncode}, sorties manquantes {missing} (voir {log_path})")
+    return seconds
+
+
+def selected_stages(names):
+    """Étapes demandées + leurs dépendances (toutes par défaut)."""
+    todo, stack = set(), list(names or STAGES)
+    while stack:
+        name = stack.pop()
+        if name not in todo:
+            todo.add(name)
+            stack.extend(STAGES[name].deps)
+    return [s for s in STAGES if s in todo]
+
+
+def run_pipeline(names=None, force=False, jobs=4, dry_run=False):
+    os.chdir(BACKEND_DIR)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+
+    todo = selected_stages(names)
+    version = db_version() if any(STAGES[n].uses_db for n in todo) else None
+    environment = environment_hash()
+    manifest = load_manifest()
+
+    done, failed = set(), set()
+    pending = list(todo)
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            # Lance toutes les étapes dont les dépendances sont prêtes
+            for name in list(pending):
+                stage = STAGES[name]
+                if any(d in failed for d in stage.deps):
+                    print(f"⏭️ {name} : ignorée (dépendance en échec)")
+                    failed.add(name)
+                    pending.remove(name)
+                    continue
+                if not all(d in done for d in stage.deps):
+                    continue
+                pending.remove(name)
+
+                key = stage_key(stage, version, environment)
+                if not force and is_cacheable(stage, version) and is_cached(stage, key):
+                    if not dry_run:
+                        restore(stage, key)
+                    print(f"⚡ {name} : inchangée, sorties reprises du cache ({key})")
+                    done.add(name)
+                    continue
+                if dry_run:
+                    print(f"📝 {name} : serait exécutée ({key})")
+                    done.add(name)
+                    continue
+
+                print(f"🚀 {name} : exécution de {stage.script}")
+                running[pool.submit(run_stage, stage)] = (stage, key)
+
+            if not running:
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage, key = running.pop(future)
+                try:
+                    seconds = future.result()
+                except Exception as e:
+                    print(f"❌ {stage.name} : échec ({e})")
+                    failed.add(stage.name)
+                    continue
+                if is_cacheable(stage, version):
+                    store(stage, key, manifest)
+                    save_manifest(manifest)
+                print(f"✅ {stage.name} : terminée en {seconds:.1f}s")
+                done.add(stage.name)
+
+    return not failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Entraîne les modèles ML en ne relançant que les étapes modifiées")
+    parser.add_argument("stages", nargs="*", help=f"Étapes à produire parmi {list(STAGES)} (toutes par défaut)")
+    parser.add_argument("--force", action="store_true", help="Ignore le cache et relance tout")
+    parser.add_argument("--jobs", type=int, default=4, help="Étapes exécutées en parallèle")
+    parser.add_argument("--dry-run", action="store_true", help="Affiche ce qui serait exécuté")
+    args = parser.parse_args()
+
+    unknown = [s for s in args.stages if s not in STAGES]
+    if unknown:
+        parser.error(f"étapes inconnues : {unknown}")
+
+    ok = run_pipeline(args.stages, force=args.force, jobs=args.jobs, dry_run=args.dry_run)
+    print("\n🏁 Pipeline terminé" + ("" if ok else " avec des erreurs"))
+    sys.exit(0 if ok else 1)
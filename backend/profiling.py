@@ -0,0 +1,169 @@
+import hmac
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from flask import g, jsonify, request
+
+from config import (
+    PROFILING_ENABLED, PROFILE_TOKEN, PROFILE_DIR, PROFILE_INTERVAL_MS,
+    PROFILE_KEEP, SLOW_REQUEST_MS, SLOW_CAPTURES_PER_MINUTE
+)
+
+
+# =========================================================
+# 🔬 Profilage par échantillonnage des requêtes
+# =========================================================
+# Un thread échantillonne la pile des threads de requête suivis toutes les
+# PROFILE_INTERVAL_MS ms. Les profils sont écrits au format "collapsed"
+# (une pile par ligne + nombre d'échantillons), lisible par flamegraph.pl /
+# speedscope. Désactivé, aucun hook n'est installé.
+
+def _collapse(frame) -> str:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(stack))
+
+
+class StackSampler:
+    def __init__(self, interval_ms: int):
+        self.interval = interval_ms / 1000
+        self._targets = {}  # thread id → Counter(pile → échantillons)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        threading.Thread(target=self._run, name="profiler-sampler", daemon=True).start()
+
+    def start(self, thread_id: int):
+        with self._lock:
+            self._targets[thread_id] = Counter()
+            self._wake.set()
+
+    def stop(self, thread_id: int) -> Counter:
+        with self._lock:
+            return self._targets.pop(thread_id, Counter())
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            with self._lock:
+                if not self._targets:
+                    # Plus rien à suivre : le thread dort jusqu'à la prochaine requête
+                    self._wake.clear()
+                    continue
+                thread_ids = list(self._targets)
+
+            frames = sys._current_frames()
+            for tid in thread_ids:
+                frame = frames.get(tid)
+                if frame is None:
+                    continue
+                stack = _collapse(frame)
+                with self._lock:
+                    samples = self._targets.get(tid)
+                    if samples is not None:
+                        samples[stack] += 1
+            time.sleep(self.interval)
+
+
+class RateLimiter:
+    """Autorise au plus `per_minute` captures automatiques par minute."""
+
+    def __init__(self, per_minute: int):
+        self.min_gap = 60 / per_minute if per_minute > 0 else float("inf")
+        self._last = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last < self.min_gap:
+                return False
+            self._last = now
+            return True
+
+
+def _authorized() -> bool:
+    token = request.headers.get("X-Profile-Token", "")
+    return bool(PROFILE_TOKEN) and hmac.compare_digest(token, PROFILE_TOKEN)
+
+
+def _write_profile(samples: Counter, reason: str, duration_ms: float) -> dict:
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+
+    endpoint = (request.endpoint or "unknown").replace(".", "_")
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-{reason}-{endpoint}-{int(duration_ms)}ms.folded"
+    path = os.path.join(PROFILE_DIR, name)
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, count in samples.most_common():
+            f.write(f"{stack} {count}\n")
+
+    # Rotation : on ne garde que les PROFILE_KEEP profils les plus récents
+    files = sorted(f for f in os.listdir(PROFILE_DIR) if f.endswith(".folded"))
+    for old in files[:-PROFILE_KEEP]:
+        os.remove(os.path.join(PROFILE_DIR, old))
+
+    return {
+        "file": name,
+        "reason": reason,
+        "method": request.method,
+        "path": request.full_path.rstrip("?"),
+        "duration_ms": round(duration_ms, 1),
+        "samples": sum(samples.values()),
+        "captured_at": time.time(),
+    }
+
+
+def init_profiling(app):
+    if not PROFILING_ENABLED:
+        return
+
+    sampler = StackSampler(PROFILE_INTERVAL_MS)
+    limiter = RateLimiter(SLOW_CAPTURES_PER_MINUTE)
+    recent = deque(maxlen=PROFILE_KEEP)
+
+    @app.before_request
+    def _start_profile():
+        explicit = request.headers.get("X-Profile") == "1" and _authorized()
+        if not explicit and not SLOW_REQUEST_MS:
+            return
+        g.profile_explicit = explicit
+        g.profile_start = time.perf_counter()
+        g.profile_thread = threading.get_ident()
+        sampler.start(g.profile_thread)
+
+    @app.after_request
+    def _stop_profile(response):
+        if "profile_thread" not in g:
+            return response
+
+        samples = sampler.stop(g.pop("profile_thread"))
+        duration_ms = (time.perf_counter() - g.profile_start) * 1000
+
+        if g.profile_explicit:
+            reason = "on-demand"
+        elif duration_ms >= SLOW_REQUEST_MS and limiter.allow():
+            reason = "slow"
+        else:
+            return response
+
+        capture = _write_profile(samples, reason, duration_ms)
+        recent.appendleft(capture)
+        if reason == "on-demand":
+            response.headers["X-Profile-File"] = capture["file"]
+        return response
+
+    @app.teardown_request
+    def _cleanup_profile(exc):
+        # Requête interrompue par une exception : on arrête le suivi du thread
+        if "profile_thread" in g:
+            sampler.stop(g.pop("profile_thread"))
+
+    @app.get("/api/debug/profiles")
+    def list_profiles():
+        if not _authorized():
+            return jsonify({"status": "error", "message": "Token de profilage invalide."}), 403
+        return jsonify({"status": "ok", "count": len(recent), "data": list(recent)})
@@ -0,0 +1,163 @@
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from database.connexion import get_connection
+from database.schema import COUNTRIES_DDL, COUNTRY_ALIASES_DDL, GAMES_DDL, ensure_fact_keys
+from utils import normalize_key
+
+# =========================================================
+# 🗺️ Dimensions pays / éditions
+# =========================================================
+# Étape post-import (appelée par load_data.py, ou seule pour une base déjà
+# importée) : les noms de pays et slugs d'éditions, répétés en texte libre
+# dans hosts / medals / results, sont ramenés à des clés entières stables
+# d'un import à l'autre (les alias existants ne sont jamais renumérotés).
+
+
+def sql_key(column):
+    """Même normalisation que normalize_key, côté MySQL (jointures ensemblistes)."""
+    return f"LOWER(REPLACE(REPLACE(TRIM({column}), ' ', ''), '-', ''))"
+
+
+def fetch_frame(cursor, query):
+    cursor.execute(query)
+    columns = [d[0] for d in cursor.description]
+    return pd.DataFrame(list(cursor.fetchall()), columns=columns)
+
+
+# === 1. Pays + alias
+def build_countries(cursor):
+    raw = fetch_frame(cursor, """
+        SELECT country_name, country_3_letter_code, COUNT(*) AS n FROM results
+        GROUP BY country_name, country_3_letter_code
+        UNION ALL
+        SELECT country_name, country_3_letter_code, COUNT(*) AS n FROM medals
+        GROUP BY country_name, country_3_letter_code
+    """)
+    raw = raw.dropna(subset=["country_name"])
+    raw["alias_key"] = raw["country_name"].map(normalize_key)
+    raw = raw[raw["alias_key"] != ""]
+
+    # Nom canonique : la graphie la plus fréquente de chaque clé
+    spellings = raw.groupby(["alias_key", "country_name"], as_index=False)["n"].sum()
+    canonical = (
+        spellings.sort_values(["n", "country_name"], ascending=[False, True], kind="mergesort")
+        .drop_duplicates("alias_key")
+    )
+    codes = (
+        raw.dropna(subset=["country_3_letter_code"])
+        .groupby(["alias_key", "country_3_letter_code"], as_index=False)["n"].sum()
+        .sort_values("n", ascending=False, kind="mergesort")
+        .drop_duplicates("alias_key")
+    )
+    canonical = canonical.merge(codes[["alias_key", "country_3_letter_code"]], on="alias_key", how="left")
+
+    cursor.execute("SELECT alias_key, country_id FROM country_aliases")
+    known = dict(cursor.fetchall())
+
+    created = 0
+    for row in canonical[~canonical["alias_key"].isin(known)].itertuples(index=False):
+        code = row.country_3_letter_code if isinstance(row.country_3_letter_code, str) else None
+        cursor.execute(
+            "INSERT INTO countries (country_name, country_3_letter_code) VALUES (%s, %s)",
+            (row.country_name, code)
+        )
+        known[row.alias_key] = cursor.lastrowid
+        cursor.execute(
+            "INSERT INTO country_aliases (alias_key, country_id) VALUES (%s, %s)",
+            (row.alias_key, cursor.lastrowid)
+        )
+        created += 1
+
+    # Codes à 3 lettres non ambigus : alias de repli quand le nom manque
+    codes = raw.dropna(subset=["country_3_letter_code"]).copy()
+    codes["country_id"] = codes["alias_key"].map(known)
+    per_code = codes.groupby(codes["country_3_letter_code"].map(normalize_key))["country_id"].unique()
+    code_rows = [(code, int(ids[0])) for code, ids in per_code.items() if code and len(ids) == 1]
+    cursor.executemany("INSERT IGNORE INTO country_aliases (alias_key, country_id) VALUES (%s, %s)", code_rows)
+
+    return created
+
+
+# === 2. Éditions des Jeux
+def build_games(cursor):
+    hosts = fetch_frame(cursor, "SELECT game_slug, game_name, game_year, game_season FROM hosts")
+    slugs = fetch_frame(cursor, """
+        SELECT DISTINCT slug_game AS game_slug FROM results
+        UNION
+        SELECT DISTINCT slug_game AS game_slug FROM medals
+    """)
+
+    # Les éditions de hosts portent année et saison ; les autres (slug seul) suivent
+    games = pd.concat([hosts, slugs], ignore_index=True).dropna(subset=["game_slug"])
+    games["game_key"] = games["game_slug"].map(normalize_key)
+    games = games[games["game_key"] != ""].drop_duplicates("game_key")
+    games["game_year"] = pd.to_numeric(games["game_year"], errors="coerce")
+
+    rows = [
+        (
+            row.game_key, row.game_slug,
+            row.game_name if isinstance(row.game_name, str) else None,
+            None if pd.isna(row.game_year) else int(row.game_year),
+            row.game_season if isinstance(row.game_season, str) else None,
+        )
+        for row in games.itertuples(index=False)
+    ]
+    cursor.executemany("""
+        INSERT INTO games (game_key, game_slug, game_name, game_year, game_season)
+        VALUES (%s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            game_name = COALESCE(VALUES(game_name), game_name),
+            game_year = COALESCE(VALUES(game_year), game_year),
+            game_season = COALESCE(VALUES(game_season), game_season)
+    """, rows)
+    return len(rows)
+
+
+# === 3. Clés sur les tables de faits (UPDATE ensemblistes)
+def link_facts(cursor):
+    ensure_fact_keys(cursor)
+
+    cursor.execute(f"""
+        UPDATE hosts h JOIN games g ON g.game_key = {sql_key("h.game_slug")}
+        SET h.game_id = g.id
+    """)
+    for table in ("medals", "results"):
+        cursor.execute(f"""
+            UPDATE {table} f JOIN games g ON g.game_key = {sql_key("f.slug_game")}
+            SET f.game_id = g.id
+        """)
+        cursor.execute(f"""
+            UPDATE {table} f JOIN country_aliases a ON a.alias_key = {sql_key("f.country_name")}
+            SET f.country_id = a.country_id
+        """)
+        cursor.execute(f"""
+            UPDATE {table} f JOIN country_aliases a ON a.alias_key = {sql_key("f.country_3_letter_code")}
+            SET f.country_id = a.country_id
+            WHERE f.country_id IS NULL
+        """)
+
+
+def build_dimensions(conn):
+    cursor = conn.cursor()
+    for ddl in (COUNTRIES_DDL, COUNTRY_ALIASES_DDL, GAMES_DDL):
+        cursor.execute(ddl)
+
+    new_countries = build_countries(cursor)
+    games = build_games(cursor)
+    link_facts(cursor)
+    conn.commit()
+    cursor.close()
+    print(f"🗺️ Dimensions à jour : {new_countries} nouveaux pays, {games} éditions")
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    conn = get_connection()
+    build_dimensions(conn)
+    conn.close()
+    print(f"⏱️ {time.perf_counter() - start:.1f}s")
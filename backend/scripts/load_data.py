@@ -1,284 +1,398 @@
-import pandas as pd
+import ast
 import json
+import math
+import os
+import sys
+import threading
+import time
 from io import StringIO
-from database.connexion import get_connection
+from multiprocessing import Process, Queue
 
-# Connexion à la base
-conn = get_connection()
-cursor = conn.cursor()
-print("✅ Connexion réussie à la base de données MySQL !")
+import pandas as pd
 
-# === 1. HOSTS (XML)
-print("🌍 Chargement des données Hosts (XML)...")
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from database.connexion import get_connection
+from database.schema import RESULTS_ATHLETES_DDL, bump_import_version
+from source_cache import cached_read
+from dimensions import build_dimensions
+from medal_tables import build_medal_tables
+
+# =========================================================
+# ⚙️ Paramètres du pipeline
+# =========================================================
+# Chaque source est parsée dans son propre processus et envoyée par paquets
+# dans une file bornée : quand les insertions prennent du retard, les
+# parseurs se bloquent (backpressure) au lieu d'empiler la mémoire.
+CHUNK_SIZE = int(os.getenv("LOAD_CHUNK_SIZE", 5000))
+QUEUE_SIZE = int(os.getenv("LOAD_QUEUE_SIZE", 8))
+INSERT_WORKERS = int(os.getenv("LOAD_INSERT_WORKERS", 4))
+
+
+# =========================================================
+# 🧩 Helpers
+# =========================================================
+def clean_value(v):
+    if v is None:
+        return None
+    if isinstance(v, float) and math.isnan(v):
+        return None
+    return str(v).strip() if isinstance(v, str) else v
 
-with open("data/olympic_hosts.xml", "r", encoding="utf-8") as f:
-    xml_data = f.read()
 
-hosts_df = pd.read_xml(StringIO(xml_data))
-print(hosts_df.head())
+def to_rows(df, columns):
+    """Lignes prêtes pour executemany (NaN → None, types Python natifs)."""
+    df = df.reindex(columns=columns).astype(object)
+    df = df.where(pd.notnull(df), None)
+    return [tuple(clean_value(v) for v in row) for row in df.itertuples(index=False, name=None)]
 
-for _, row in hosts_df.iterrows():
-    sql = """
-        INSERT INTO hosts (game_slug, game_end_date, game_start_date, game_location, game_name, game_season, game_year)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
-    """
-    values = (
-        row["game_slug"],
-        row["game_end_date"],
-        row["game_start_date"],
-        row["game_location"],
-        row["game_name"],
-        row["game_season"],
-        row["game_year"],
-    )
-    cursor.execute(sql, values)
 
-conn.commit()
-print(f"✅ {len(hosts_df)} hôtes insérés avec succès !")
+# Fonction sécurisée pour la colonne athletes
+def parse_participants(val):
+    """Liste des participants (nom, url) d'un résultat d'équipe.
 
+    La colonne contient selon les exports une liste, du JSON ou un littéral
+    Python (liste de tuples) : tout ce qui n'est pas lisible donne [].
+    """
+    if isinstance(val, str) and val.strip().startswith("["):
+        try:
+            val = json.loads(val)
+        except ValueError:
+            try:
+                val = ast.literal_eval(val)
+            except (ValueError, SyntaxError):
+                return []
+    if not isinstance(val, (list, tuple)):
+        return []
+
+    participants = []
+    for item in val:
+        if isinstance(item, dict):
+            name, url = item.get("athlete_full_name") or item.get("name"), item.get("athlete_url") or item.get("url")
+        elif isinstance(item, (list, tuple)) and item:
+            name, url = item[0], (item[1] if len(item) > 1 else None)
+        else:
+            continue
+        participants.append((clean_value(name), clean_value(url)))
+    return participants
+
+
+# =========================================================
+# 📖 Parseurs (exécutés dans des processus séparés)
+# =========================================================
+HOSTS_COLUMNS = [
+    "game_slug", "game_end_date", "game_start_date", "game_location",
+    "game_name", "game_season", "game_year",
+]
+
+MEDALS_COLUMNS = [
+    "discipline_title", "slug_game", "event_title", "event_gender", "medal_type",
+    "participant_type", "participant_title", "athlete_url", "athlete_full_name",
+    "country_name", "country_code", "country_3_letter_code",
+]
+
+ATHLETES_COLUMNS = [
+    "athlete_url", "athlete_full_name", "games_participations", "first_game",
+    "athlete_year_birth", "athlete_medals", "bio",
+]
+
+RESULTS_COLUMNS = [
+    "discipline_title", "event_title", "slug_game", "participant_type", "medal_type",
+    "rank_equal", "rank_position", "country_name", "country_code", "country_3_letter_code",
+    "athlete_url", "athlete_full_name", "value_unit", "value_type",
+]
 
-# === 2. MEDALS (EXCEL)
-print("🥇 Chargement des données Médailles (Excel)...")
 
-medals_df = pd.read_excel("data/olympic_medals.xlsx")
+# === 1. HOSTS (XML)
+def read_hosts_xml(path):
+    with open(path, "r", encoding="utf-8") as f:
+        xml_data = f.read()
+    return pd.read_xml(StringIO(xml_data))
 
-# 🔧 Remplacer les NaN par None pour éviter l’erreur MySQL
-medals_df = medals_df.where(pd.notnull(medals_df), None)
 
-print(medals_df.head())
+def parse_hosts():
+    hosts_df = cached_read("data/olympic_hosts.xml", "read_xml", read_hosts_xml)
+    return to_rows(hosts_df, HOSTS_COLUMNS)
 
-for _, row in medals_df.iterrows():
-    sql = """
-        INSERT INTO medals (
-            discipline_title, slug_game, event_title, event_gender, medal_type,
-            participant_type, participant_title, athlete_url, athlete_full_name,
-            country_name, country_code, country_3_letter_code
-        )
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    """
-    values = (
-        row["discipline_title"],
-        row["slug_game"],
-        row["event_title"],
-        row["event_gender"],
-        row["medal_type"],
-        row["participant_type"],
-        row["participant_title"],
-        row["athlete_url"],
-        row["athlete_full_name"],
-        row["country_name"],
-        row["country_code"],
-        row["country_3_letter_code"],
-    )
-    cursor.execute(sql, values)
-
-conn.commit()
-print(f"✅ {len(medals_df)} lignes de médailles insérées avec succès !")
 
+# === 2. MEDALS (EXCEL)
+def parse_medals():
+    medals_df = cached_read("data/olympic_medals.xlsx", "read_excel", pd.read_excel)
+    return to_rows(medals_df, MEDALS_COLUMNS)
 
 
 # === 3. ATHLETES (JSON)
-print("🏃‍♂️ Chargement des données Athlètes (JSON)...")
-
-import json
-
-# Lis le fichier JSON brut
-with open("data/olympic_athletes.json", "r", encoding="utf-8") as f:
-    data = json.load(f)
+def read_athletes_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return pd.DataFrame(data)
 
-# 🔍 Si c’est une liste d’objets
-print(f"Type de data : {type(data)}")
-print(f"Nombre d'éléments : {len(data)}")
-print("Premier élément du JSON :")
-print(json.dumps(data[0], indent=2, ensure_ascii=False))
 
-# Ensuite, charge dans pandas pour voir la structure
-import pandas as pd
-athletes_df = pd.DataFrame(data)
+def parse_athletes():
+    athletes_df = cached_read("data/olympic_athletes.json", "json", read_athletes_json)
+    return to_rows(athletes_df, ATHLETES_COLUMNS)
 
-print("Colonnes détectées :")
-print(athletes_df.columns.tolist())
 
-print("\nAperçu du DataFrame :")
-print(athletes_df.head(10))
+# === 4. RESULTS (HTML)
+def read_results_html(path):
+    return pd.read_html(path)[0]
 
 
+def parse_results():
+    results_df = cached_read("data/olympic_results.html", "read_html", read_results_html)
+    results_df.columns = results_df.columns.str.lower().str.replace(" ", "_").str.strip()
 
-# === 3. ATHLETES (JSON)
-print("🏃‍♂️ Chargement des données Athlètes (JSON)...")
+    rows = to_rows(results_df, RESULTS_COLUMNS)
+    athletes = results_df["athletes"] if "athletes" in results_df.columns else [None] * len(rows)
 
-import json
-import math
-import numpy as np
-from database.connexion import get_connection
+    # Chaque ligne emporte ses participants ; un résultat individuel porte
+    # directement son athlète (athlete_full_name, athlete_url).
+    parsed = []
+    for values, raw in zip(rows, athletes):
+        participants = parse_participants(raw)
+        if not participants and (values[10] or values[11]):
+            participants = [(values[11], values[10])]
+        parsed.append((values, participants))
+    return parsed
 
-# Lecture du fichier JSON
-with open("data/olympic_athletes.json", "r", encoding="utf-8") as f:
-    data = json.load(f)
 
-# Conversion en DataFrame
-athletes_df = pd.DataFrame(data)
-print(athletes_df.head())
+PARSERS = {
+    "hosts": parse_hosts,
+    "medals": parse_medals,
+    "athletes": parse_athletes,
+    "results": parse_results,
+}
 
-# Fonction utilitaire pour nettoyer les NaN / float
-def clean_value(v):
-    if v is None:
-        return None
-    if isinstance(v, float) and math.isnan(v):
-        return None
-    return v
 
-# === Insertion par "chunks" (blocs de 5000 lignes)
-chunk_size = 5000
-chunks = np.array_split(athletes_df, math.ceil(len(athletes_df) / chunk_size))
+def run_parser(source, queue):
+    start = time.perf_counter()
+    try:
+        rows = PARSERS[source]()
+        parse_seconds = time.perf_counter() - start
+        print(f"📖 {source} : {len(rows)} lignes parsées en {parse_seconds:.1f}s")
 
-total_inserted = 0
-chunk_number = 1
+        for i in range(0, len(rows), CHUNK_SIZE):
+            queue.put(("rows", source, rows[i:i + CHUNK_SIZE]))  # bloque si la file est pleine
 
-for chunk in chunks:
-    print(f"🚀 Insertion du chunk {chunk_number}/{len(chunks)}...")
+        queue.put(("parsed", source, parse_seconds))
+    except Exception as e:
+        queue.put(("error", source, f"{type(e).__name__}: {e}"))
+
+
+# =========================================================
+# 💾 Insertions (threads, une connexion MySQL par worker)
+# =========================================================
+INSERT_SQL = {
+    "hosts": f"""
+        INSERT INTO hosts ({", ".join(HOSTS_COLUMNS)})
+        VALUES ({", ".join(["%s"] * len(HOSTS_COLUMNS))})
+    """,
+    "medals": f"""
+        INSERT INTO medals ({", ".join(MEDALS_COLUMNS)})
+        VALUES ({", ".join(["%s"] * len(MEDALS_COLUMNS))})
+    """,
+    "athletes": f"""
+        INSERT INTO athletes ({", ".join(ATHLETES_COLUMNS)})
+        VALUES ({", ".join(["%s"] * len(ATHLETES_COLUMNS))})
+    """,
+    "results": f"""
+        INSERT INTO results ({", ".join(RESULTS_COLUMNS)})
+        VALUES ({", ".join(["%s"] * len(RESULTS_COLUMNS))})
+    """,
+}
+
+PARTICIPANT_SQL = """
+    INSERT INTO results_athletes (result_id, athlete_full_name, athlete_url)
+    VALUES (%s, %s, %s)
+"""
+
+
+def insert_chunk(cursor, source, rows):
+    if source != "results":
+        cursor.executemany(INSERT_SQL[source], rows)
+        return len(rows)
+
+    # Les résultats sont insérés ligne à ligne : lastrowid sert de clé
+    # étrangère aux participants, quel que soit l'entrelacement des workers.
+    count = 0
+    participant_rows = []
+    for values, participants in rows:
+        try:
+            cursor.execute(INSERT_SQL["results"], values)
+        except Exception as e:
+            print(f"⚠️ Erreur sur un résultat : {e}")
+            continue
+        count += 1
+        participant_rows.extend((cursor.lastrowid, name, url) for name, url in participants)
+    cursor.executemany(PARTICIPANT_SQL, participant_rows)
+    return count
+
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.parse_seconds = {}
+        self.insert_seconds = {s: 0.0 for s in PARSERS}
+        self.inserted = {s: 0 for s in PARSERS}
+        self.errors = {}
+
+    def add_insert(self, source, count, seconds):
+        with self.lock:
+            self.inserted[source] += count
+            self.insert_seconds[source] += seconds
+
+
+def drop_connection(conn):
+    """Rollback best-effort puis fermeture : le paquet suivant repart d'une connexion neuve."""
+    for action in (conn.rollback, conn.close):
+        try:
+            action()
+        except Exception:
+            pass
+    return None
+
+
+def insert_worker(queue, stats):
+    # Connexion ouverte au premier paquet et rouverte après un échec : un
+    # worker ne meurt jamais, sinon la file se remplit et les parseurs bloquent.
+    conn = None
+
+    while True:
+        kind, source, payload = queue.get()
+        if kind == "stop":
+            break
+        if kind == "parsed":
+            stats.parse_seconds[source] = payload
+            continue
+        if kind == "error":
+            stats.errors[source] = payload
+            print(f"❌ Parsing {source} échoué : {payload}")
+            continue
+
+        start = time.perf_counter()
+        # Un paquet en échec est retenté une fois sur une nouvelle connexion
+        for attempt in range(2):
+            try:
+                if conn is None:
+                    conn = get_connection()
+                conn.ping(reconnect=True)  # évite le timeout entre deux paquets
+                cursor = conn.cursor()
+                count = insert_chunk(cursor, source, payload)
+                cursor.close()
+                conn.commit()
+                error = None
+                break
+            except Exception as e:
+                error = e
+                if conn is not None:
+                    conn = drop_connection(conn)
+                if attempt == 0:
+                    print(f"⚠️ Insertion {source} échouée ({e}), nouvelle tentative")
+
+        if error is not None:
+            # On continue de vider la file pour ne pas bloquer les parseurs ;
+            # main() refusera de publier l'import
+            stats.errors[source] = str(error)
+            print(f"❌ Insertion {source} échouée : {error}")
+            continue
+        stats.add_insert(source, count, time.perf_counter() - start)
+        print(f"✅ {source} : +{count} lignes ({stats.inserted[source]} au total)")
+
+    if conn is not None:
+        conn.close()
+
+
+def print_source_timings(stats):
+    print("\n⏱️ Temps par étape :")
+    for source in PARSERS:
+        parse_s = stats.parse_seconds.get(source)
+        parse_txt = f"{parse_s:.1f}s" if parse_s is not None else "échec"
+        print(f"  - {source:<9} parsing {parse_txt:>7} | insertion {stats.insert_seconds[source]:.1f}s "
+              f"| {stats.inserted[source]} lignes")
+
+
+# =========================================================
+# 🚀 Pipeline complet
+# =========================================================
+def main():
+    start = time.perf_counter()
 
-    # Ouvre une nouvelle connexion à chaque bloc pour éviter le timeout
     conn = get_connection()
     cursor = conn.cursor()
+    cursor.execute(RESULTS_ATHLETES_DDL)
+    conn.commit()
 
-    for _, row in chunk.iterrows():
-        sql = """
-            INSERT INTO athletes (
-                athlete_url,
-                athlete_full_name,
-                games_participations,
-                first_game,
-                athlete_year_birth,
-                athlete_medals,
-                bio
-            )
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """
-        values = tuple(clean_value(row[col]) for col in [
-            "athlete_url",
-            "athlete_full_name",
-            "games_participations",
-            "first_game",
-            "athlete_year_birth",
-            "athlete_medals",
-            "bio"
-        ])
-        cursor.execute(sql, values)
-
+    queue = Queue(maxsize=QUEUE_SIZE)
+    stats = Stats()
+
+    workers = [
+        threading.Thread(target=insert_worker, args=(queue, stats), name=f"insert-{i}")
+        for i in range(INSERT_WORKERS)
+    ]
+    for w in workers:
+        w.start()
+
+    parsers = [Process(target=run_parser, args=(source, queue), name=f"parse-{source}") for source in PARSERS]
+    for p in parsers:
+        p.start()
+
+    # Un processus ne se termine qu'une fois ses paquets vidés dans la file :
+    # les messages "stop" arrivent donc après toutes les données.
+    for p in parsers:
+        while p.is_alive():
+            p.join(timeout=1)
+            # Filet de sécurité : sans worker vivant, la file pleine bloquerait les parseurs
+            if not any(w.is_alive() for w in workers):
+                for q in parsers:
+                    q.terminate()
+                raise RuntimeError("Tous les workers d'insertion se sont arrêtés : import interrompu.")
+    for _ in workers:
+        queue.put(("stop", None, None))
+    for w in workers:
+        w.join()
+
+    # Parseur mort sans message (OOM, kill...) : aucune erreur n'est arrivée par la file
+    for p, source in zip(parsers, PARSERS):
+        if p.exitcode != 0 and source not in stats.errors:
+            stats.errors[source] = f"processus de parsing terminé avec le code {p.exitcode}"
+        elif source not in stats.parse_seconds and source not in stats.errors:
+            stats.errors[source] = "parsing terminé sans signaler sa fin"
+
+    # Import partiel : ni dimensions, ni tableaux des médailles, ni nouvelle version
+    # (l'API en mémoire et le pipeline ML s'appuient sur cette version)
+    if stats.errors:
+        cursor.close()
+        conn.close()
+        print_source_timings(stats)
+        print("\n❌ Import incomplet, version non publiée. Sources en erreur :")
+        for source, error in stats.errors.items():
+            print(f"  - {source} : {error}")
+        sys.exit(1)
+
+    # === 5. Dimensions pays / éditions (clés entières sur les tables de faits)
+    conn.ping(reconnect=True)
+    dimensions_start = time.perf_counter()
+    build_dimensions(conn)
+    dimensions_seconds = time.perf_counter() - dimensions_start
+
+    # === 6. Tableaux des médailles par édition (classement précalculé)
+    medal_tables_start = time.perf_counter()
+    build_medal_tables(conn)
+    medal_tables_seconds = time.perf_counter() - medal_tables_start
+
+    # === 7. Version d'import (l'API rechargera ses données en mémoire)
+    bump_import_version(cursor)
     conn.commit()
     cursor.close()
     conn.close()
+    print("🏷️ Nouvelle version d'import enregistrée.")
 
-    total_inserted += len(chunk)
-    print(f"✅ Chunk {chunk_number} terminé ({total_inserted}/{len(athletes_df)})")
-    chunk_number += 1
-
-print(f"🎯 Import complet : {total_inserted} athlètes insérés avec succès !")
-
-
-
-
-# === 4. RESULTS (HTML)
-print("📊 Chargement des données Résultats (HTML)...")
-
-import json
-import math
-
-# Lecture du tableau HTML
-results_list = pd.read_html("data/olympic_results.html")
-results_df = results_list[0]
-results_df.columns = results_df.columns.str.lower().str.replace(" ", "_").str.strip()
-results_df = results_df.where(pd.notnull(results_df), None)
-
-print(f"✅ Fichier HTML chargé avec {len(results_df)} lignes.")
-print(results_df.head())
-
-# Fonction utilitaire
-def clean_value(v):
-    if v is None:
-        return None
-    if isinstance(v, float) and math.isnan(v):
-        return None
-    return str(v).strip() if isinstance(v, str) else v
-
-# Fonction sécurisée pour les données JSON
-def safe_json(val):
-    """Convertit proprement la colonne athletes en JSON valide"""
-    try:
-        if isinstance(val, list):
-            return json.dumps(val, ensure_ascii=False)
-        if isinstance(val, str) and val.strip().startswith("["):
-            json.loads(val)  # vérifie que c’est bien un JSON
-            return val
-        return json.dumps([], ensure_ascii=False)
-    except Exception:
-        return json.dumps([], ensure_ascii=False)
-
-# Insertion avec commits progressifs
-batch_size = 1000
-count = 0
-
-for _, row in results_df.iterrows():
-    sql = """
-        INSERT INTO results (
-            discipline_title,
-            event_title,
-            slug_game,
-            participant_type,
-            medal_type,
-            athletes,
-            rank_equal,
-            rank_position,
-            country_name,
-            country_code,
-            country_3_letter_code,
-            athlete_url,
-            athlete_full_name,
-            value_unit,
-            value_type
-        )
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    """
-
-    athletes_json = safe_json(row.get("athletes"))
-
-    values = (
-        clean_value(row.get("discipline_title")),
-        clean_value(row.get("event_title")),
-        clean_value(row.get("slug_game")),
-        clean_value(row.get("participant_type")),
-        clean_value(row.get("medal_type")),
-        athletes_json,
-        clean_value(row.get("rank_equal")),
-        clean_value(row.get("rank_position")),
-        clean_value(row.get("country_name")),
-        clean_value(row.get("country_code")),
-        clean_value(row.get("country_3_letter_code")),
-        clean_value(row.get("athlete_url")),
-        clean_value(row.get("athlete_full_name")),
-        clean_value(row.get("value_unit")),
-        clean_value(row.get("value_type")),
-    )
-
-    try:
-        cursor.execute(sql, values)
-        count += 1
-    except Exception as e:
-        print(f"⚠️ Erreur sur ligne {count}: {e}")
-
-    # Commit tous les 1000
-    if count % batch_size == 0:
-        conn.commit()
-        print(f"✅ {count} résultats insérés...")
-
-# Dernier commit
-conn.commit()
-print(f"🎯 Import terminé avec succès ({count} lignes).")
-
+    total = time.perf_counter() - start
+    print_source_timings(stats)
+    print(f"  - dimensions {dimensions_seconds:.1f}s")
+    print(f"  - tableaux des médailles {medal_tables_seconds:.1f}s")
+    print(f"  ➜ total {total:.1f}s")
+    print("🏁 Importation complète terminée avec succès ! 🎉")
 
 
-# === Fermeture propre ===
-cursor.close()
-conn.close()
-print("🏁 Importation complète terminée avec succès ! 🎉")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from database.connexion import get_connection
+from database.schema import MEDAL_TABLES_DDL
+from dimensions import fetch_frame
+
+# =========================================================
+# 🏅 Tableaux des médailles par édition
+# =========================================================
+# Étape post-import (après dimensions.py) : une seule passe vectorisée sur
+# la table medals produit le classement de toutes les éditions.
+MEDAL_COLUMNS = {"GOLD": "gold", "SILVER": "silver", "BRONZE": "bronze"}
+# Une médaille par équipe est stockée une fois par athlète : une seule par équipe et par épreuve.
+# Les lignes individuelles (participant_type "Athlete") comptent toutes, ex-aequo compris.
+TEAM_KEYS = ["game_id", "country_id", "discipline_title", "event_title", "event_gender",
+             "participant_title", "medal_type"]
+TABLE_COLUMNS = ["game_id", "country_id", "gold", "silver", "bronze", "total", "medal_rank"]
+
+
+def compute_medal_tables(medals):
+    """Lignes de medals (une par athlète médaillé) → classement par édition.
+
+    Une médaille par équipe compte une fois par équipe et par épreuve ; deux
+    athlètes ex-aequo d'un même pays comptent deux médailles. Ordre officiel :
+    or, puis argent, puis bronze. Les pays à égalité sur les trois compteurs
+    partagent le même rang, le suivant saute (1, 2, 2, 4).
+    """
+    medals = medals.dropna(subset=["game_id", "country_id"])
+    medals = medals.assign(medal_type=medals["medal_type"].str.strip().str.upper())
+    medals = medals[medals["medal_type"].isin(MEDAL_COLUMNS)]
+    is_team = medals["participant_type"].eq("GameTeam")
+    medals = pd.concat([medals[~is_team], medals[is_team].drop_duplicates(TEAM_KEYS)])
+    if medals.empty:
+        return pd.DataFrame(columns=TABLE_COLUMNS)
+
+    table = (
+        medals.groupby(["game_id", "country_id", "medal_type"]).size()
+        .unstack(fill_value=0)
+        .reindex(columns=list(MEDAL_COLUMNS), fill_value=0)
+        .rename(columns=MEDAL_COLUMNS)
+        .rename_axis(columns=None)
+        .reset_index()
+    )
+    table["total"] = table[["gold", "silver", "bronze"]].sum(axis=1)
+
+    table = table.sort_values(
+        ["game_id", "gold", "silver", "bronze", "country_id"],
+        ascending=[True, False, False, False, True],
+        kind="mergesort", ignore_index=True
+    )
+    position = table.groupby("game_id").cumcount() + 1
+    keys = ["game_id", "gold", "silver", "bronze"]
+    tied = table[keys].eq(table[keys].shift()).all(axis=1)
+    table["medal_rank"] = position.mask(tied).ffill()
+
+    return table[TABLE_COLUMNS].astype(int)
+
+
+def build_medal_tables(conn):
+    cursor = conn.cursor()
+    cursor.execute(MEDAL_TABLES_DDL)
+
+    medals = fetch_frame(cursor, """
+        SELECT game_id, country_id, discipline_title, event_title, event_gender,
+               participant_type, participant_title, medal_type
+        FROM medals
+        WHERE game_id IS NOT NULL AND country_id IS NOT NULL
+    """)
+    table = compute_medal_tables(medals)
+
+    # Reconstruction complète dans la même transaction (quelques milliers de lignes)
+    cursor.execute("DELETE FROM medal_tables")
+    cursor.executemany(
+        f"INSERT INTO medal_tables ({', '.join(TABLE_COLUMNS)}) VALUES ({', '.join(['%s'] * len(TABLE_COLUMNS))})",
+        list(table.itertuples(index=False, name=None))
+    )
+    conn.commit()
+    cursor.close()
+    print(f"🏅 Tableaux des médailles : {table['game_id'].nunique()} éditions, {len(table)} lignes")
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    conn = get_connection()
+    build_medal_tables(conn)
+    conn.close()
+    print(f"⏱️ {time.perf_counter() - start:.1f}s")
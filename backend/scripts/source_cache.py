@@ -0,0 +1,94 @@
+import glob
+import hashlib
+import inspect
+import json
+import os
+
+import pandas as pd
+
+# =========================================================
+# 🗃️ Cache des sources parsées
+# =========================================================
+# read_excel (openpyxl) et read_html (lxml) dominent le temps d'import.
+# Le DataFrame parsé est stocké en Parquet, sous une clé dérivée du contenu
+# du fichier, du code du parseur, de ses options et de la version de pandas :
+# un fichier modifié (ou un parseur modifié ou appelé autrement) produit une
+# nouvelle clé, l'ancienne entrée est purgée.
+CACHE_DIR = os.getenv("SOURCE_CACHE_DIR", os.path.join("data", ".cache"))
+CACHE_ENABLED = os.getenv("SOURCE_CACHE", "1") == "1"
+
+# À incrémenter si le format des DataFrames mis en cache change
+CACHE_FORMAT_VERSION = 1
+
+
+def _file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _reader_fingerprint(read_fn) -> dict:
+    """Identité du parseur : nom qualifié + empreinte de son code source."""
+    try:
+        source = inspect.getsource(read_fn)
+    except (OSError, TypeError):
+        source = ""  # fonction native : seul le nom (et pandas.__version__) compte
+    return {
+        # __qualname__ seul : __module__ vaut "__main__" quand load_data.py est lancé directement
+        "name": getattr(read_fn, "__qualname__", repr(read_fn)),
+        "source": hashlib.sha256(source.encode()).hexdigest(),
+    }
+
+
+def _cache_key(path: str, parser: str, read_fn, options: dict) -> str:
+    h = hashlib.sha256()
+    h.update(_file_digest(path).encode())
+    h.update(json.dumps(
+        {
+            "parser": parser,
+            "reader": _reader_fingerprint(read_fn),
+            "options": options,
+            "pandas": pd.__version__,
+            "version": CACHE_FORMAT_VERSION,
+        },
+        sort_keys=True, default=str
+    ).encode())
+    return h.hexdigest()[:24]
+
+
+def _arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """Parquet refuse les colonnes objet aux types mélangés (ex. rang "1" / 1)."""
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True).startswith("mixed"):
+            df[col] = df[col].map(lambda v: v if v is None or isinstance(v, str) or pd.isna(v) else str(v))
+    return df
+
+
+def cached_read(path: str, parser: str, read_fn, **options) -> pd.DataFrame:
+    """Retourne read_fn(path, **options), depuis le cache si la source n'a pas changé."""
+    if not CACHE_ENABLED:
+        return read_fn(path, **options)
+
+    stem = os.path.basename(path)
+    key = _cache_key(path, parser, read_fn, options)
+    cache_path = os.path.join(CACHE_DIR, f"{stem}.{key}.parquet")
+
+    if os.path.exists(cache_path):
+        print(f"⚡ {stem} : lu depuis le cache")
+        return pd.read_parquet(cache_path)
+
+    # Même typage au premier import qu'aux suivants (lus depuis Parquet)
+    df = _arrow_safe(read_fn(path, **options))
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    for old in glob.glob(os.path.join(CACHE_DIR, f"{stem}.*.parquet")):
+        os.remove(old)
+
+    # Écriture atomique : un import concurrent ne lit jamais un fichier partiel
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, cache_path)
+    return df
@@ -0,0 +1,63 @@
+import threading
+
+
+# =========================================================
+# 🛬 Regroupement des requêtes identiques (single-flight)
+# =========================================================
+# Quand plusieurs clients demandent la même requête coûteuse en même temps,
+# seul le premier l'exécute ; les autres attendent (au plus `timeout` s) et
+# reçoivent le même résultat, ou la même exception.
+
+class SingleFlightTimeout(Exception):
+    pass
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self, timeout: float = 30):
+        self.timeout = timeout
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.counters = {"executed": 0, "db_calls_saved": 0, "timeouts": 0, "errors": 0}
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.counters["executed"] += 1
+
+        if leader:
+            try:
+                call.result = fn()
+            except Exception as e:
+                call.error = e
+                with self._lock:
+                    self.counters["errors"] += 1
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        elif call.done.wait(self.timeout):
+            # Compté une fois le résultat partagé reçu : un abandon n'économise rien
+            with self._lock:
+                self.counters["db_calls_saved"] += 1
+        else:
+            with self._lock:
+                self.counters["timeouts"] += 1
+            raise SingleFlightTimeout(f"Requête identique toujours en cours après {self.timeout}s")
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self.counters, "in_flight": len(self._calls)}
@@ -0,0 +1,102 @@
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts')))
+from medal_tables import compute_medal_tables
+
+
+def medal(game_id, country_id, discipline, event, gender, medal_type, athlete):
+    """Médaille individuelle : une ligne par athlète (participant_type "Athlete")."""
+    return {
+        "game_id": game_id, "country_id": country_id, "discipline_title": discipline,
+        "event_title": event, "event_gender": gender, "medal_type": medal_type,
+        "participant_type": "Athlete", "participant_title": None, "athlete_full_name": athlete,
+    }
+
+
+def team(game_id, country_id, discipline, event, gender, medal_type, title, athletes):
+    """Médaille par équipe : une ligne par membre (participant_type "GameTeam")."""
+    return [
+        {
+            "game_id": game_id, "country_id": country_id, "discipline_title": discipline,
+            "event_title": event, "event_gender": gender, "medal_type": medal_type,
+            "participant_type": "GameTeam", "participant_title": title, "athlete_full_name": athlete,
+        }
+        for athlete in athletes
+    ]
+
+
+def test_team_medal_counts_once_per_event():
+    rows = (
+        team(1, 10, "Bobsleigh", "4-man", "Men", "GOLD", "Germany", ["A", "B", "C", "D"])
+        + team(1, 10, "Luge", "Team Relay", "Mixed", "GOLD", "Germany", ["E", "F", "G", "H"])
+        + [medal(1, 10, "Luge", "Men's Singles", "Men", "GOLD", "E")]
+        + team(1, 20, "Cross Country Skiing", "4 x 10km Relay", "Men", "SILVER", "Norway", ["I", "J"])
+    )
+    table = compute_medal_tables(pd.DataFrame(rows)).set_index("country_id")
+
+    assert table.loc[10, ["gold", "silver", "bronze", "total"]].tolist() == [3, 0, 0, 3]
+    assert table.loc[20, ["gold", "silver", "bronze", "total"]].tolist() == [0, 1, 0, 1]
+
+
+def test_tied_individual_medals_count_twice():
+    # Atlanta 1996, concours général : Amanar et Milosovici (Roumanie) bronze ex-aequo
+    rows = [
+        medal(1, 10, "Artistic Gymnastics", "Individual All-Around", "Women", "BRONZE", "Simona Amanar"),
+        medal(1, 10, "Artistic Gymnastics", "Individual All-Around", "Women", "BRONZE", "Lavinia Milosovici"),
+        medal(1, 20, "Artistic Gymnastics", "Individual All-Around", "Women", "GOLD", "Lilia Podkopayeva"),
+    ]
+    table = compute_medal_tables(pd.DataFrame(rows)).set_index("country_id")
+
+    assert table.loc[10, ["gold", "silver", "bronze", "total"]].tolist() == [0, 0, 2, 2]
+
+
+def test_two_teams_of_one_country_in_same_event_count_twice():
+    rows = (
+        team(1, 10, "Bobsleigh", "2-man", "Men", "GOLD", "Germany I", ["A", "B"])
+        + team(1, 10, "Bobsleigh", "2-man", "Men", "GOLD", "Germany II", ["C", "D"])
+    )
+    table = compute_medal_tables(pd.DataFrame(rows))
+
+    assert table["gold"].tolist() == [2]
+
+
+def test_same_event_title_for_each_gender_counts_twice():
+    rows = (
+        team(1, 10, "Curling", "Curling", "Men", "GOLD", "Sweden", ["A", "B"])
+        + team(1, 10, "Curling", "Curling", "Women", "GOLD", "Sweden", ["C", "D"])
+    )
+    table = compute_medal_tables(pd.DataFrame(rows))
+
+    assert table["gold"].tolist() == [2]
+
+
+def test_ranking_ties_share_rank_per_games():
+    rows = []
+    # Édition 1 : le pays 10 gagne un relais (4 lignes) mais 20 a deux ors individuels
+    rows += team(1, 10, "Biathlon", "Relay", "Men", "GOLD", "France", ["A", "B", "C", "D"])
+    rows += [medal(1, 20, "Biathlon", "Sprint", "Men", "GOLD", "E"),
+             medal(1, 20, "Biathlon", "Pursuit", "Men", "GOLD", "E")]
+    # 30 et 40 à égalité parfaite (1 argent), 50 derrière (1 bronze)
+    rows += [medal(1, 30, "Biathlon", "Sprint", "Men", "SILVER", "F"),
+             medal(1, 40, "Biathlon", "Pursuit", "Men", "SILVER", "G"),
+             medal(1, 50, "Biathlon", "Sprint", "Men", "BRONZE", "H")]
+    # Édition 2 : classement indépendant
+    rows += [medal(2, 50, "Biathlon", "Sprint", "Women", "gold ", "I")]
+
+    table = compute_medal_tables(pd.DataFrame(rows))
+    ranks = {(g, c): r for g, c, r in table[["game_id", "country_id", "medal_rank"]].itertuples(index=False)}
+
+    assert ranks == {(1, 20): 1, (1, 10): 2, (1, 30): 3, (1, 40): 3, (1, 50): 5, (2, 50): 1}
+
+
+def test_rows_without_keys_or_medal_are_ignored():
+    rows = [
+        medal(1, None, "Luge", "Singles", "Men", "GOLD", "A"),
+        medal(1, 10, "Luge", "Singles", "Men", "PARTICIPANT", "B"),
+    ]
+    table = compute_medal_tables(pd.DataFrame(rows))
+
+    assert table.empty
@@ -1,8 +1,10 @@
 import os
 import json
-import joblib
-import pandas as pd
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+# joblib / pandas sont importés à l'usage : l'API démarre sans eux
+if TYPE_CHECKING:
+    import pandas as pd
 
 def safe_load_json(path: str) -> Optional[Dict[str, Any]]:
     if not os.path.exists(path):
@@ -13,9 +15,20 @@ def safe_load_json(path: str) -> Optional[Dict[str, Any]]:
 def safe_load_model(path: str):
     if not os.path.exists(path):
         return None
+    import joblib
     return joblib.load(path)
 
-def ensure_columns(df: pd.DataFrame, cols: list[str]) -> pd.DataFrame:
+def normalize_key(x):
+    """Clé de rapprochement : minuscules, sans espaces ni tirets ("Paris 2024" ≡ "paris-2024")."""
+    if isinstance(x, str):
+        return x.strip().lower().replace(" ", "").replace("-", "")
+    return x
+
+def records(df: "pd.DataFrame") -> list:
+    """to_dict(records) avec None (et non NaN) pour les catégories manquantes."""
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+def ensure_columns(df: "pd.DataFrame", cols: list[str]) -> "pd.DataFrame":
     for c in cols:
         if c not in df.columns:
             df[c] = None